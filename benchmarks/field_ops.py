@@ -0,0 +1,53 @@
+import random
+import time
+
+from utils.field import Field, FieldElement
+
+
+def ops_per_second(op, pairs: list, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for a, b in pairs:
+            op(a, b)
+        best = min(best, time.perf_counter() - start)
+    return len(pairs) / best
+
+
+def bench_field_ops(field: Field, num_ops: int = 200_000):
+    rng = random.Random(0)
+    raw_pairs = [
+        (rng.randrange(field.p), rng.randrange(1, field.p)) for _ in range(num_ops)
+    ]
+    element_pairs = [
+        (FieldElement(field, a), FieldElement(field, b)) for a, b in raw_pairs
+    ]
+
+    element_ops = {
+        "add": lambda a, b: a + b,
+        "sub": lambda a, b: a - b,
+        "mul": lambda a, b: a * b,
+        "neg": lambda a, b: -a,
+    }
+    raw_ops = {
+        "add": field.add_raw,
+        "sub": field.sub_raw,
+        "mul": field.mul_raw,
+        "neg": lambda a, b: field.neg_raw(a),
+    }
+
+    print(f"Field {field}, {num_ops} operations per measurement")
+    print(f"{'op':>6} {'FieldElement ops/s':>20} {'raw ops/s':>14}")
+    for name, op in element_ops.items():
+        element_rate = ops_per_second(op, element_pairs)
+        raw_rate = ops_per_second(raw_ops[name], raw_pairs)
+        print(f"{name:>6} {element_rate:>20,.0f} {raw_rate:>14,.0f}")
+
+    inv_pairs = element_pairs[: num_ops // 100]
+    element_rate = ops_per_second(lambda a, b: b ** -1, inv_pairs)
+    raw_rate = ops_per_second(lambda a, b: field.inv_raw(b), raw_pairs[: num_ops // 100])
+    print(f"{'inv':>6} {element_rate:>20,.0f} {raw_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    bench_field_ops(Field.main())
@@ -0,0 +1,18 @@
+from benchmarks.prover_fields import bench_prover
+from utils.field import Field
+from utils.params import GlobalParameters
+from utils.reed_solomon import num_folding_rounds
+
+
+if __name__ == "__main__":
+    degree = 127
+    results = []
+    for factor in (2, 4, 8, 16):
+        GlobalParameters.use_folding_factor(factor)
+        results.append((factor, num_folding_rounds(degree), *bench_prover(Field.main(), degree)))
+    GlobalParameters.use_folding_factor(2)
+
+    print(f"Domain size {GlobalParameters.size_of_group}, polynomial degree {degree}")
+    print(f"{'factor':>7} {'rounds':>7} {'prove (s)':>10} {'verify (s)':>11} {'proof bytes':>12}")
+    for factor, rounds, prove_time, verify_time, size in results:
+        print(f"{factor:>7} {rounds:>7} {prove_time:>10.3f} {verify_time:>11.3f} {size:>12}")
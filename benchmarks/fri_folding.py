@@ -0,0 +1,51 @@
+import random
+import time
+
+from utils.domain import Domain
+from utils.extension_field import ExtensionField
+from utils.field import Field, FieldVector
+from utils.fri import FoldingEngine
+
+
+def fold_with_vectors(codeword: FieldVector, alpha, domain: Domain):
+    # Folding as done before the engine: FieldVector ops, a batch inversion
+    # and a squared domain per layer.
+    half = len(codeword) // 2
+    assert domain.values[:half] == -domain.values[half:]
+    f_x, f_minus_x = codeword[:half], codeword[half:]
+    x_inv = domain.values[:half].inverse()
+    folded = ((f_x + f_minus_x) + (f_x - f_minus_x) * x_inv * alpha) * alpha.field.two_inv
+    return folded, domain.sq_domain()
+
+
+def bench_folding(field: Field, log_size: int, layers: int, extension_degree: int = 1):
+    rng = random.Random(0)
+    n = 1 << log_size
+    challenge_field = field if extension_degree == 1 else ExtensionField(field, extension_degree)
+    domain = Domain.generate_domain(field.primitive_nth_root(n), n).offset_domain(field.generator())
+    codeword = FieldVector(field, [rng.randrange(field.p) for _ in range(n)])
+    alphas = [challenge_field.sample(rng.randbytes(32)) for _ in range(layers)]
+
+    start = time.perf_counter()
+    curr, curr_domain = codeword, domain
+    for alpha in alphas:
+        curr, curr_domain = fold_with_vectors(curr, alpha, curr_domain)
+    vectors = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = FoldingEngine(domain)
+    setup = time.perf_counter() - start
+    curr = codeword
+    for layer, alpha in enumerate(alphas):
+        curr = engine.fold(curr, alpha, layer)
+        engine.domain(layer + 1)
+    engine_time = time.perf_counter() - start
+    print(
+        f"{field.p.bit_length()}-bit field, degree {extension_degree} challenges, n = 2^{log_size}, {layers} layers: "
+        f"vectors {vectors:.2f}s, engine {engine_time:.2f}s (of which tables {setup:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    bench_folding(Field.main(), 20, 10)
+    bench_folding(Field.goldilocks(), 20, 10, 2)
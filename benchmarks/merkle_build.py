@@ -0,0 +1,49 @@
+import hashlib
+import random
+import time
+
+from utils.field import Field, FieldElement, FieldVector
+from utils.merkle_tree import MerkleTree
+from utils.params import GlobalParameters
+
+
+def int_hash(x: FieldElement | int) -> int:
+    # Hashing as done before bytes digests: 32-byte big-endian int, sha256,
+    # hex digest parsed back into an int.
+    if isinstance(x, FieldElement):
+        x = int(x)
+    return int(hashlib.sha256(x.to_bytes(32, "big")).hexdigest(), 16)
+
+
+def build_with_int_hashes(leaves: FieldVector) -> int:
+    # Same heap layout, nodes combined as H(left) ^ H(right).
+    level = list(leaves)
+    while len(level) > 1:
+        level = [int_hash(a) ^ int_hash(b) for a, b in zip(level[::2], level[1::2])]
+    return level[0]  # type: ignore
+
+
+def leaves_per_second(func, n: int) -> float:
+    start = time.perf_counter()
+    func()
+    return n / (time.perf_counter() - start)
+
+
+def bench_merkle(field: Field, log_sizes: range):
+    rng = random.Random(0)
+    print(f"Field {field}, Merkle tree build throughput (leaves/s)")
+    print(f"{'n':>8}{'int/xor':>12}" + "".join(f"{name:>12}" for name in GlobalParameters.hash_functions))
+    for log_size in log_sizes:
+        n = 1 << log_size
+        leaves = FieldVector(field, [rng.randrange(field.p) for _ in range(n)])
+        row = f"{n:>8}{leaves_per_second(lambda: build_with_int_hashes(leaves), n):>12.0f}"
+        for name in GlobalParameters.hash_functions:
+            GlobalParameters.use_hash(name)
+            # encoding included: the prover commits from the codeword
+            row += f"{leaves_per_second(lambda: MerkleTree(leaves.to_bytes(), GlobalParameters.hash_function), n):>12.0f}"
+        print(row)
+    GlobalParameters.use_hash("sha256")
+
+
+if __name__ == "__main__":
+    bench_merkle(Field.main(), range(12, 19, 2))
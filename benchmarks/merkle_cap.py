@@ -0,0 +1,17 @@
+from benchmarks.prover_fields import bench_prover
+from utils.field import Field
+from utils.params import GlobalParameters
+
+
+if __name__ == "__main__":
+    degree = 127
+    results = []
+    for cap_height in range(0, 6):
+        GlobalParameters.merkle_cap_height = cap_height
+        results.append((cap_height, *bench_prover(Field.main(), degree)))
+    GlobalParameters.merkle_cap_height = 0
+
+    print(f"Domain size {GlobalParameters.size_of_group}, polynomial degree {degree}, folding factor {GlobalParameters.folding_factor}")
+    print(f"{'cap height':>11} {'prove (s)':>10} {'verify (s)':>11} {'proof bytes':>12}")
+    for cap_height, prove_time, verify_time, size in results:
+        print(f"{cap_height:>11} {prove_time:>10.3f} {verify_time:>11.3f} {size:>12}")
@@ -0,0 +1,38 @@
+import os
+import random
+import time
+
+from utils.field import Field
+from utils.ntt import four_step_ntt_raw, ntt_raw
+
+
+def best_time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_engines(field: Field, log_sizes: range, max_workers: int):
+    rng = random.Random(0)
+    p = field.p
+    workers = [1 << i for i in range(max_workers.bit_length()) if 1 << i <= max_workers]
+    if workers[-1] != max_workers:
+        workers.append(max_workers)
+    print(f"Field {field}, time per NTT of n points (s), four-step with 1 to {max_workers} processes")
+    print(f"{'n':>8}{'radix2':>10}" + "".join(f"{f'4step/{w}':>10}" for w in workers))
+    for log_size in log_sizes:
+        n = 1 << log_size
+        coeffs = [rng.randrange(p) for _ in range(n)]
+        g = field.primitive_nth_root(n).value
+        row = f"{n:>8}{best_time(lambda: ntt_raw(coeffs, g, p), 1):>10.3f}"
+        for w in workers:
+            # The first call also starts the pool, so keep the best of two.
+            row += f"{best_time(lambda: four_step_ntt_raw(coeffs, g, p, 1, w), 2):>10.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    bench_engines(Field.main(), range(14, 21, 2), os.cpu_count() or 1)
@@ -0,0 +1,47 @@
+import math
+import random
+import time
+
+from utils.field import Field
+from utils.polynomial import karatsuba_raw, kronecker_multiply_raw, ntt_multiply_raw, schoolbook_raw
+
+
+def best_time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_strategies(field: Field, log_sizes: range, karatsuba_base: int = 32):
+    rng = random.Random(0)
+    p = field.p
+    # Quadratic strategies are skipped once they would take minutes.
+    strategies = {
+        "schoolbook": (1 << 11, lambda lhs, rhs: schoolbook_raw(lhs, rhs, p)),
+        "karatsuba": (1 << 13, lambda lhs, rhs: karatsuba_raw(lhs, rhs, p, karatsuba_base)),
+        "ntt": (1 << 16, lambda lhs, rhs: ntt_multiply_raw(lhs, rhs, field)),
+        "kronecker": (1 << 16, lambda lhs, rhs: kronecker_multiply_raw(lhs, rhs, p)),
+    }
+    print(f"Field {field}, time per product of two polynomials with n coefficients (ms)")
+    print(f"{'n':>6}" + "".join(f"{name:>12}" for name in strategies))
+    for log_size in log_sizes:
+        n = 1 << log_size
+        lhs = [rng.randrange(p) for _ in range(n)]
+        rhs = [rng.randrange(p) for _ in range(n)]
+        row = f"{n:>6}"
+        for max_size, multiply in strategies.values():
+            if n > max_size:
+                row += f"{math.nan:>12.3f}"
+                continue
+            repeat = 3 if n <= 1 << 12 else 1
+            row += f"{best_time(lambda: multiply(lhs, rhs), repeat) * 1e3:>12.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    for field in (Field.main(), Field.goldilocks()):
+        bench_strategies(field, range(2, 17))
+        print()
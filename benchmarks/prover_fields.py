@@ -0,0 +1,57 @@
+import random
+import time
+
+from utils.field import Field, FieldElement
+from utils.params import GlobalParameters
+from utils.polynomial import Polynomial
+from utils.proof_stream import ProofStream
+from utils.reed_solomon import Prover, Verifier
+
+
+class RandomPolynomialSource:
+    """Stands in for a StateMachine: hands the prover a random polynomial of fixed degree."""
+
+    def __init__(self, field: Field, degree: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.polynomial = Polynomial(
+            [FieldElement(field, rng.randrange(field.p)) for _ in range(degree + 1)]
+        )
+
+    def compute_polynomial(self, domain):
+        return self.polynomial
+
+
+# Extension degree for the FRI challenges, so that each backend gets >= ~90 bits.
+EXTENSION_DEGREES = {"main": 1, "goldilocks": 2, "babybear": 3}
+
+
+def bench_prover(field: Field, degree: int, extension_degree: int = 1) -> tuple[float, float, int]:
+    GlobalParameters.use_field(field, extension_degree)
+    source = RandomPolynomialSource(field, degree)
+
+    start = time.perf_counter()
+    proof_stream = ProofStream()
+    Prover(source, degree).prove(proof_stream)  # type: ignore
+    prove_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert Verifier(degree).verify(proof_stream), f"Proof over {field} did not verify."
+    verify_time = time.perf_counter() - start
+
+    return prove_time, verify_time, len(proof_stream.serialization())
+
+
+if __name__ == "__main__":
+    degree = 31
+    results = []
+    for name in Field.backends:
+        extension_degree = EXTENSION_DEGREES.get(name, 1)
+        results.append(
+            (f"{name}^{extension_degree}", *bench_prover(Field.from_backend(name), degree, extension_degree))
+        )
+    GlobalParameters.use_field(Field.main())
+
+    print(f"Domain size {GlobalParameters.size_of_group}, polynomial degree {degree}")
+    print(f"{'field':>12} {'prove (s)':>10} {'verify (s)':>11} {'proof bytes':>12}")
+    for name, prove_time, verify_time, size in results:
+        print(f"{name:>12} {prove_time:>10.3f} {verify_time:>11.3f} {size:>12}")
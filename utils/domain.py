@@ -1,15 +1,25 @@
-from utils.field import FieldElement
+from utils.field import FieldElement, FieldVector
 from typing import Callable
 
 class Domain:
-    def __init__(self, generator, values: list[FieldElement]):
+    # values = offset * generator^i: a subgroup when offset is one, a coset of it otherwise
+    def __init__(self, generator, values: "list[FieldElement] | FieldVector", offset: "FieldElement | None" = None):
         self.generator = generator
-        self.values = values
+        self.values = FieldVector.from_elements(generator.field, values)
         self.size = len(values)
+        self.offset = generator.field.one if offset is None else offset
 
     @staticmethod
     def generate_domain(generator: FieldElement, size: int):
-        return Domain(generator, [generator**i for i in range(size)])  # type: ignore (issue with polynomial option)
+        field = generator.field
+        p = field.p
+        g = generator.value
+        values = [0] * size
+        acc = 1
+        for i in range(size):
+            values[i] = acc
+            acc = acc * g % p
+        return Domain(generator, FieldVector(field, values))
 
     def map_domain(self, map: Callable[[FieldElement], FieldElement]):
         new_values = [map(ele) for ele in self.values]
@@ -17,13 +27,12 @@ class Domain:
         return Domain(new_generator, new_values)
 
     def offset_domain(self, offset: FieldElement):
-        return self.map_domain(lambda x: offset * x)
+        return Domain(self.generator, self.values * offset, self.offset * offset)
 
     def sq_domain(self):
         new_size = self.size // 2
-        new_values = [(self.values[i] ** 2) for i in range(new_size)]
-        return Domain(self.generator ** 2, new_values) #type: ignore (issue with FieldElement)
+        new_values = self.values[:new_size] ** 2
+        return Domain(self.generator ** 2, new_values, self.offset ** 2) #type: ignore (issue with FieldElement)
 
     def __len__(self):
         return len(self.values)
-
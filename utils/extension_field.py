@@ -0,0 +1,309 @@
+from functools import cached_property
+
+from utils.field import Field, FieldElement, FieldException
+
+
+class ExtensionFieldElement(FieldElement):
+    """
+    Element of an ExtensionField. `value` is the tuple of its coefficients
+    (c_0, ..., c_{k-1}) over the base field, standing for sum(c_i * X^i).
+    Base field elements are promoted on the fly, and since this class
+    derives from FieldElement its reflected operators run first for mixed
+    base/extension expressions such as `base * ext`.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, b: object) -> "bool":
+        if not isinstance(b, FieldElement):
+            return False
+        if b.field is self.field.base:
+            b = self.field.lift(b)
+        return self.field is b.field and self.value == b.value
+
+    def __radd__(self, b: "FieldElement") -> "FieldElement":
+        return self.field.add(self.field.coerce(b), self)
+
+    def __rsub__(self, b: "FieldElement") -> "FieldElement":
+        return self.field.sub(self.field.coerce(b), self)
+
+    def __rmul__(self, b: "FieldElement") -> "FieldElement":
+        return self.field.mul(self.field.coerce(b), self)
+
+    def __rtruediv__(self, b: "FieldElement") -> "FieldElement":
+        return self.field.truediv(self.field.coerce(b), self)
+
+    def __int__(self) -> "int":
+        p = self.field.base.p
+        res = 0
+        for c in reversed(self.value):
+            res = res * p + c
+        return res
+
+    def is_zero(self) -> "bool":
+        return not any(self.value)
+
+
+class ExtensionField:
+    """
+    Binomial extension F_p[X] / (X^k - W) of a prime field, for k = 2 or 3.
+    W is the smallest integer >= 2 that is not a q-th power for the prime q = k,
+    which makes X^k - W irreducible as long as k divides p - 1.
+    """
+
+    _instances: "dict[tuple[int, int], ExtensionField]" = {}
+
+    def __new__(cls, base: "Field", degree: "int"):
+        key = (base.p, degree)
+        field = ExtensionField._instances.get(key)
+        if field is None:
+            if degree not in (2, 3):
+                raise FieldException("Only quadratic and cubic extensions are supported.")
+            if (base.p - 1) % degree != 0:
+                raise FieldException(
+                    f"X^{degree} - W is never irreducible over {base}: {degree} does not divide p - 1."
+                )
+            field = super().__new__(cls)
+            field.base = base
+            field.degree = degree
+            field.nonresidue = ExtensionField.find_nonresidue(base, degree)
+            # frobenius[i] = W^(i * (p - 1) / k), so that (X^i)^p = frobenius[i] * X^i
+            exp = (base.p - 1) // degree
+            field.frobenius = [pow(field.nonresidue, i * exp, base.p) for i in range(degree)]
+            field.zero = field.element((0,) * degree)
+            field.one = field.element((1,) + (0,) * (degree - 1))
+            ExtensionField._instances[key] = field
+        return field
+
+    @staticmethod
+    def find_nonresidue(base: "Field", degree: "int") -> "int":
+        p = base.p
+        w = 2
+        while pow(w, (p - 1) // degree, p) == 1:
+            w += 1
+        return w
+
+    def __reduce__(self):
+        return (ExtensionField, (self.base, self.degree))
+
+    def __repr__(self):
+        return f"{self.base}[X]/(X^{self.degree} - {self.nonresidue})"
+
+    @property
+    def order(self) -> "int":
+        return self.base.p**self.degree
+
+    def mod(self, value: "int | tuple[int, ...] | list[int]") -> "tuple[int, ...]":
+        p = self.base.p
+        if isinstance(value, int):
+            return (value % p,) + (0,) * (self.degree - 1)
+        if len(value) > self.degree:
+            raise FieldException(f"Too many coefficients for an element of {self}.")
+        return tuple(c % p for c in value) + (0,) * (self.degree - len(value))
+
+    def element(self, value: "tuple[int, ...]") -> "ExtensionFieldElement":
+        elt = object.__new__(ExtensionFieldElement)
+        elt.field = self
+        elt.value = value
+        return elt
+
+    def lift(self, a: "FieldElement") -> "ExtensionFieldElement":
+        if a.field is self:
+            return a  # type: ignore
+        if a.field is not self.base:
+            raise FieldException(
+                "Operations between terms from different fields are prohibited."
+            )
+        return self.element(self.lift_raw(a.value))
+
+    def lift_raw(self, a: "int") -> "tuple[int, ...]":
+        return (a,) + (0,) * (self.degree - 1)
+
+    def coerce(self, a: "FieldElement") -> "ExtensionFieldElement":
+        if not isinstance(a, FieldElement):
+            raise FieldException(
+                "Operations are only defined between FieldElement instances."
+            )
+        return self.lift(a)
+
+    def sample(self, seed: "bytes") -> "ExtensionFieldElement":
+        # Reads the seed as an integer and takes its first k digits in base p.
+        p = self.base.p
+        x = int.from_bytes(seed, "big")
+        coefs = []
+        for _ in range(self.degree):
+            x, c = divmod(x, p)
+            coefs.append(c)
+        return self.element(tuple(coefs))
+
+    # Raw arithmetic on coefficient tuples.
+
+    def add_raw(self, a: "tuple[int, ...]", b: "tuple[int, ...]") -> "tuple[int, ...]":
+        p = self.base.p
+        return tuple((x + y) % p for x, y in zip(a, b))
+
+    def sub_raw(self, a: "tuple[int, ...]", b: "tuple[int, ...]") -> "tuple[int, ...]":
+        p = self.base.p
+        return tuple((x - y) % p for x, y in zip(a, b))
+
+    def neg_raw(self, a: "tuple[int, ...]") -> "tuple[int, ...]":
+        p = self.base.p
+        return tuple(-x % p for x in a)
+
+    def scale_raw(self, a: "tuple[int, ...]", c: "int") -> "tuple[int, ...]":
+        p = self.base.p
+        return tuple(x * c % p for x in a)
+
+    def mul_raw(self, a: "tuple[int, ...]", b: "tuple[int, ...]") -> "tuple[int, ...]":
+        # Karatsuba: 3 base multiplications for k = 2, 6 for k = 3.
+        p = self.base.p
+        w = self.nonresidue
+        if self.degree == 2:
+            a0, a1 = a
+            b0, b1 = b
+            v0 = a0 * b0
+            v1 = a1 * b1
+            return ((v0 + w * v1) % p, ((a0 + a1) * (b0 + b1) - v0 - v1) % p)
+        a0, a1, a2 = a
+        b0, b1, b2 = b
+        v0 = a0 * b0
+        v1 = a1 * b1
+        v2 = a2 * b2
+        return (
+            (v0 + w * ((a1 + a2) * (b1 + b2) - v1 - v2)) % p,
+            ((a0 + a1) * (b0 + b1) - v0 - v1 + w * v2) % p,
+            ((a0 + a2) * (b0 + b2) - v0 + v1 - v2) % p,
+        )
+
+    def frobenius_raw(self, a: "tuple[int, ...]") -> "tuple[int, ...]":
+        # a -> a^p, which is linear: X^i -> frobenius[i] * X^i
+        p = self.base.p
+        return tuple(c * f % p for c, f in zip(a, self.frobenius))
+
+    def norm_raw(self, a: "tuple[int, ...]") -> "int":
+        conjugates = self._conjugate_product(a)
+        return self.mul_raw(a, conjugates)[0]
+
+    def _conjugate_product(self, a: "tuple[int, ...]") -> "tuple[int, ...]":
+        # a^p * a^(p^2) * ... * a^(p^(k-1)), so that a times it is the norm of a.
+        conj = self.frobenius_raw(a)
+        prod = conj
+        for _ in range(self.degree - 2):
+            conj = self.frobenius_raw(conj)
+            prod = self.mul_raw(prod, conj)
+        return prod
+
+    def inv_raw(self, a: "tuple[int, ...]") -> "tuple[int, ...]":
+        if not any(a):
+            raise FieldException("Division by zero.")
+        conj = self._conjugate_product(a)
+        norm = self.mul_raw(a, conj)[0]
+        return self.scale_raw(conj, self.base.inv_raw(norm))
+
+    def pow_raw(self, a: "tuple[int, ...]", exp: "int") -> "tuple[int, ...]":
+        if exp < 0:
+            a, exp = self.inv_raw(a), -exp
+        res = self.one.value
+        while exp:
+            if exp & 1:
+                res = self.mul_raw(res, a)
+            a = self.mul_raw(a, a)
+            exp >>= 1
+        return res
+
+    def batch_inverse_raw(self, values: "list[tuple[int, ...]]") -> "list[tuple[int, ...]]":
+        n = len(values)
+        if n == 0:
+            return []
+        prefix = [self.one.value] * n
+        acc = self.one.value
+        for i, value in enumerate(values):
+            if not any(value):
+                raise FieldException("Division by zero.")
+            prefix[i] = acc
+            acc = self.mul_raw(acc, value)
+        acc = self.inv_raw(acc)
+        inverses = [self.one.value] * n
+        for i in range(n - 1, -1, -1):
+            inverses[i] = self.mul_raw(acc, prefix[i])
+            acc = self.mul_raw(acc, values[i])
+        return inverses
+
+    def batch_inverse(self, elements: "list[FieldElement]") -> "list[ExtensionFieldElement]":
+        return [
+            self.element(v)
+            for v in self.batch_inverse_raw([self.coerce(e).value for e in elements])
+        ]
+
+    @cached_property
+    def two_inv(self) -> "ExtensionFieldElement":
+        return self.element(self.lift_raw(self.base.two_inv_raw))
+
+    @cached_property
+    def byte_length(self) -> "int":
+        return self.degree * self.base.byte_length
+
+    def encode_raw(self, a: "tuple[int, ...]") -> "bytes":
+        # Coefficients c_0, ..., c_{k-1}, each in the base field encoding
+        length = self.base.byte_length
+        return b"".join(c.to_bytes(length, "big") for c in a)
+
+    # FieldElement operations, promoting base field operands.
+
+    def add(self, a: "FieldElement", b: "FieldElement") -> "ExtensionFieldElement":
+        return self.element(self.add_raw(self.coerce(a).value, self.coerce(b).value))
+
+    def sub(self, a: "FieldElement", b: "FieldElement") -> "ExtensionFieldElement":
+        return self.element(self.sub_raw(self.coerce(a).value, self.coerce(b).value))
+
+    def mul(self, a: "FieldElement", b: "FieldElement") -> "ExtensionFieldElement":
+        if b.field is self.base:
+            return self.element(self.scale_raw(self.coerce(a).value, b.value))
+        if a.field is self.base:
+            return self.element(self.scale_raw(self.coerce(b).value, a.value))
+        return self.element(self.mul_raw(self.coerce(a).value, self.coerce(b).value))
+
+    def pow(self, a: "FieldElement", exp: "int") -> "ExtensionFieldElement":
+        return self.element(self.pow_raw(self.coerce(a).value, exp))
+
+    def truediv(self, a: "FieldElement", b: "FieldElement") -> "ExtensionFieldElement":
+        return self.element(
+            self.mul_raw(self.coerce(a).value, self.inv_raw(self.coerce(b).value))
+        )
+
+    def repr_element(self, a: "FieldElement") -> "str":
+        return f"{a.value} in {self}"
+
+
+if __name__ == "__main__":
+    import random
+
+    def test_field_axioms(ext: "ExtensionField"):
+        rng = random.Random(0)
+        p = ext.base.p
+
+        def rand():
+            return ext.element(tuple(rng.randrange(p) for _ in range(ext.degree)))
+
+        for _ in range(50):
+            a, b, c = rand(), rand(), rand()
+            assert (a + b) * c == a * c + b * c
+            assert a * b == b * a
+            assert (a * b) * c == a * (b * c)
+            if not a.is_zero():
+                assert a * (a**-1) == ext.one
+                assert (a * b) / a == b
+            assert a**p == ext.element(ext.frobenius_raw(a.value))
+
+        x = ext.base.element(rng.randrange(1, p))
+        a = rand()
+        assert x * a == ext.lift(x) * a and a * x == ext.lift(x) * a
+        assert x + a == a + x and x - a == -(a - x)
+        assert ext.lift(x) == x
+
+        values = [rand() for _ in range(20)]
+        assert all(v * w == ext.one for v, w in zip(values, ext.batch_inverse(values)))
+
+    test_field_axioms(ExtensionField(Field.goldilocks(), 2))
+    test_field_axioms(ExtensionField(Field.babybear(), 3))
+    test_field_axioms(ExtensionField(Field.main(), 2))
@@ -1,4 +1,7 @@
 
+from functools import cached_property
+
+
 class FieldException(Exception):
     def __init__(self, message: str):
         super().__init__(message)
@@ -9,6 +12,7 @@ class FieldException(Exception):
 
 
 class FieldElement:
+    __slots__ = ("field", "value")
 
     def __init__(self, field: "Field", value: "int"):
         self.field = field
@@ -17,7 +21,7 @@ class FieldElement:
     def __eq__(self, b: object) -> "bool":
         if not isinstance(b, FieldElement):
             return False
-        return self.field == b.field and self.value == b.value
+        return self.field is b.field and self.value == b.value
 
     def __repr__(self):
         return self.field.repr_element(self)
@@ -57,7 +61,13 @@ class FieldElement:
 
 
     def __neg__(self) -> "FieldElement":
-        return FieldElement(self.field, -self.value)
+        return self.field.element(self.field.neg_raw(self.value))
+
+    def __int__(self) -> "int":
+        return self.value
+
+    def __bytes__(self) -> "bytes":
+        return self.field.encode_raw(self.value)
 
     def is_zero(self) -> "bool":
         return self.value == 0
@@ -66,23 +76,37 @@ class FieldElement:
     def field_eq(elts: "list[FieldElement]") -> "bool":
         if len(elts) > 0:
             for elt in elts[1:]:
-                if elt.field != elts[0].field:
+                if elt.field is not elts[0].field:
                     return False
         return True
 
 
 class Field:
-
-    def __init__(self, p: "int"):
-        self.p = p
-        self.zero = FieldElement(self, 0)
-        self.one = FieldElement(self, 1)
+    # Fields are interned by modulus, so that two elements belong to the same
+    # field exactly when their `field` attributes are the same object.
+    _instances: "dict[int, Field]" = {}
+
+    def __new__(cls, p: "int"):
+        field = Field._instances.get(p)
+        if field is None:
+            field = super().__new__(cls)
+            field.p = p
+            field.zero = field.element(0)
+            field.one = field.element(1)
+            Field._instances[p] = field
+        return field
+
+    def __reduce__(self):
+        return (Field, (self.p,))
 
     def __eq__(self, field2: object):
         if not isinstance(field2, Field):
             return False
         return self.p == field2.p
 
+    def __hash__(self):
+        return hash(self.p)
+
     def __neq__(self, field2: "Field"):
         return self.p != field2.p
 
@@ -92,76 +116,348 @@ class Field:
     def mod(self, value):
         return value % self.p
 
+    def element(self, value: "int") -> "FieldElement":
+        # Wraps a residue that is already reduced modulo p, skipping `mod`.
+        elt = object.__new__(FieldElement)
+        elt.field = self
+        elt.value = value
+        return elt
+
+    # Raw arithmetic on residues (plain ints in [0, p)), for hot loops that
+    # only wrap their results into FieldElements at the API boundary.
+
+    def sample(self, seed: "bytes") -> "FieldElement":
+        return self.element(int.from_bytes(seed, "big") % self.p)
+
+    def add_raw(self, a: "int", b: "int") -> "int":
+        return (a + b) % self.p
+
+    def sub_raw(self, a: "int", b: "int") -> "int":
+        return (a - b) % self.p
+
+    def mul_raw(self, a: "int", b: "int") -> "int":
+        return (a * b) % self.p
+
+    def neg_raw(self, a: "int") -> "int":
+        return -a % self.p
+
+    def inv_raw(self, a: "int") -> "int":
+        if a % self.p == 0:
+            raise FieldException("Division by zero.")
+        return pow(a, self.p - 2, self.p)
+
+    def pow_raw(self, a: "int", exp: "int") -> "int":
+        if exp < 0:
+            return pow(self.inv_raw(a), -exp, self.p)
+        return pow(a, exp, self.p)
+
+    def batch_inverse_raw(self, values: "list[int]") -> "list[int]":
+        # Montgomery's trick: one inversion and 3(n-1) multiplications.
+        p = self.p
+        n = len(values)
+        if n == 0:
+            return []
+        prefix = [0] * n
+        acc = 1
+        for i, value in enumerate(values):
+            if value % p == 0:
+                raise FieldException("Division by zero.")
+            prefix[i] = acc
+            acc = acc * value % p
+        acc = pow(acc, p - 2, p)
+        inverses = [0] * n
+        for i in range(n - 1, -1, -1):
+            inverses[i] = acc * prefix[i] % p
+            acc = acc * values[i] % p
+        return inverses
+
+    def batch_inverse(self, elements: "list[FieldElement]") -> "list[FieldElement]":
+        if not FieldElement.field_eq(elements) or (
+            len(elements) > 0 and elements[0].field is not self
+        ):
+            raise FieldException(
+                "Operations between terms from different fields are prohibited."
+            )
+        return [self.element(v) for v in self.batch_inverse_raw([e.value for e in elements])]
+
+    @cached_property
+    def two_inv_raw(self) -> "int":
+        return self.inv_raw(2)
+
+    @cached_property
+    def two_inv(self) -> "FieldElement":
+        return self.element(self.two_inv_raw)
+
+    # Canonical encoding: the residue in big-endian order, on a fixed number
+    # of bytes, which is what gets hashed into commitments.
+
+    @cached_property
+    def byte_length(self) -> "int":
+        return (self.p.bit_length() + 7) // 8
+
+    def encode_raw(self, a: "int") -> "bytes":
+        return a.to_bytes(self.byte_length, "big")
+
     def add(self, a: "FieldElement", b: "FieldElement") -> "FieldElement":
-        if a.field != b.field:
+        if a.field is not b.field:
             raise FieldException(
                 "Operations between terms from different fields are prohibited."
             )
-        return FieldElement(self, (a.value + b.value) % self.p)
+        return self.element((a.value + b.value) % self.p)
 
     def sub(self, a: "FieldElement", b: "FieldElement") -> "FieldElement":
-        if a.field != b.field:
+        if a.field is not b.field:
             raise FieldException(
                 "Operations between terms from different fields are prohibited."
             )
-        return FieldElement(self, (a.value - b.value) % self.p)
+        return self.element((a.value - b.value) % self.p)
 
     def mul(self, a: "FieldElement", b: "FieldElement") -> "FieldElement":
-        if a.field != b.field:
+        if a.field is not b.field:
             raise FieldException(
                 "Operations between terms from different fields are prohibited."
             )
-        return FieldElement(self, (a.value * b.value) % self.p)
+        return self.element((a.value * b.value) % self.p)
 
     def pow(self, a: "FieldElement", exp: "int") -> "FieldElement":
-        if exp == -1:
-            return a ** int(self.p - 2)
-        if exp == 0:
-            return self.one
-        if exp == 1:
-            return a
-        b = FieldElement(self, (a.value**2) % self.p)
-        return self.pow(b, exp // 2) * self.pow(a, exp % 2)
+        return self.element(self.pow_raw(a.value, exp))
 
     def truediv(self, a: "FieldElement", b: "FieldElement") -> "FieldElement":
-        if a.field != b.field:
+        if a.field is not b.field:
             raise FieldException(
                 "Operations between terms from different fields are prohibited."
             )
         if b.is_zero():
             raise FieldException("Division by zero.")
         assert isinstance(b, FieldElement)
-        return self.mul(a, b ** - 1)
+        return self.element((a.value * self.inv_raw(b.value)) % self.p)
 
     def repr_element(self, a: "FieldElement") -> "str":
         return f"{a.value} in {self}"
 
-    def generator(self):
-        assert self.p == 1 + 407 * (
-            1 << 119
-        ), "Do not know generator for other fields beyond 1+407*2^119"
-        return FieldElement(self, 85408008396924667383611388730472331217)
+    def generator(self) -> "FieldElement":
+        if self.p not in Field._generators:
+            raise FieldException(f"No backend registered for {self}, generator unknown.")
+        return self.element(Field._generators[self.p])
+
+    @cached_property
+    def two_adicity(self) -> "int":
+        return ((self.p - 1) & -(self.p - 1)).bit_length() - 1
+
+    @cached_property
+    def two_adic_roots(self) -> "list[int]":
+        # two_adic_roots[k] is a primitive 2^k-th root of unity.
+        p = self.p
+        root = pow(self.generator().value, (p - 1) >> self.two_adicity, p)
+        roots = [root]
+        for _ in range(self.two_adicity):
+            root = root * root % p
+            roots.append(root)
+        return roots[::-1]
+
+    def has_nth_root(self, n: "int") -> "bool":
+        return self.p in Field._generators and n <= 1 << self.two_adicity
 
     def primitive_nth_root(self, n):
-        if self.p == 1 + 407 * (1 << 119):
-            assert (
-                n <= 1 << 119 and (n & (n - 1)) == 0
-            ), "Field does not have nth root of unity where n > 2^119 or not power of two."
-            root = FieldElement(self, 85408008396924667383611388730472331217)
-            order = 1 << 119
-            while order != n:
-                root = root**2  # type: ignore
-                order = order / 2
-            return root
-        else:
-            assert False, "Unknown field, can't return root of unity."
+        assert (
+            n <= 1 << self.two_adicity and (n & (n - 1)) == 0
+        ), f"Field does not have nth root of unity where n > 2^{self.two_adicity} or not power of two."
+        return self.element(self.two_adic_roots[n.bit_length() - 1])
+
+    # Backend registry: name -> (modulus, generator of the multiplicative group).
+    backends: "dict[str, tuple[int, int]]" = {}
+    _generators: "dict[int, int]" = {}
+
+    @staticmethod
+    def register_backend(name: "str", p: "int", generator: "int") -> None:
+        Field.backends[name] = (p, generator)
+        Field._generators[p] = generator
+
+    @classmethod
+    def from_backend(cls, name: "str") -> "Field":
+        if name not in Field.backends:
+            raise FieldException(f"Unknown field backend {name!r}.")
+        return cls(Field.backends[name][0])
 
     @classmethod
     def main(cls):
         p = 1 + 407 * (1 << 119)  # 1 + 11 * 37 * 2^119
         return cls(p)
 
+    @classmethod
+    def goldilocks(cls):
+        return cls.from_backend("goldilocks")
+
+    @classmethod
+    def babybear(cls):
+        return cls.from_backend("babybear")
+
+
+Field.register_backend("main", 1 + 407 * (1 << 119), 7)
+Field.register_backend("goldilocks", (1 << 64) - (1 << 32) + 1, 7)  # 2^32 * (2^32 - 1) + 1
+Field.register_backend("babybear", 15 * (1 << 27) + 1, 31)
+
 
 class MainFieldElement(FieldElement):
+    __slots__ = ()
+
     def __init__(self, p: int):
         super().__init__(Field.main(), p)
+
+
+class FieldVector:
+    """
+    Contiguous vector of field elements, stored as a list of residues in [0, p).
+    Arithmetic is element-wise and runs over the raw ints in bulk; indexing and
+    iteration hand out FieldElements, so it can stand in for list[FieldElement].
+    """
+
+    __slots__ = ("field", "residues")
+
+    def __init__(self, field: "Field", residues: "list[int]"):
+        self.field = field
+        self.residues = residues
+
+    @classmethod
+    def from_elements(cls, field: "Field", elements: "list[FieldElement]") -> "FieldVector":
+        if isinstance(elements, FieldVector):
+            return elements
+        for elt in elements:
+            if elt.field is not field:
+                raise FieldException(
+                    "Operations between terms from different fields are prohibited."
+                )
+        return cls(field, [elt.value for elt in elements])
+
+    def to_elements(self) -> "list[FieldElement]":
+        element = self.field.element
+        return [element(v) for v in self.residues]
+
+    def to_bytes(self) -> "list[bytes]":
+        """Canonical encoding of every element."""
+        return list(map(self.field.encode_raw, self.residues))
+
+    def __len__(self) -> "int":
+        return len(self.residues)
+
+    def __iter__(self):
+        element = self.field.element
+        for v in self.residues:
+            yield element(v)
+
+    def __getitem__(self, index: "int | slice") -> "FieldElement | FieldVector":
+        if isinstance(index, slice):
+            return FieldVector(self.field, self.residues[index])
+        return self.field.element(self.residues[index])
+
+    def __eq__(self, b: object) -> "bool":
+        if not isinstance(b, FieldVector):
+            return False
+        return self.field is b.field and self.residues == b.residues
+
+    def __repr__(self):
+        return f"FieldVector({self.residues}, field = {self.field})"
+
+    def lift(self, field) -> "FieldVector":
+        """Promotes the vector into the extension field `field`."""
+        lift_raw = field.lift_raw
+        return FieldVector(field, [lift_raw(v) for v in self.residues])
+
+    def _coerce(self, b: "FieldVector") -> "tuple[FieldVector, FieldVector]":
+        # Lifts whichever operand lives in the base field of the other one's extension.
+        if len(self) != len(b):
+            raise FieldException("Element-wise operations need vectors of equal length.")
+        if self.field is b.field:
+            return self, b
+        if getattr(b.field, "base", None) is self.field:
+            return self.lift(b.field), b
+        if getattr(self.field, "base", None) is b.field:
+            return self, b.lift(self.field)
+        raise FieldException(
+            "Operations between terms from different fields are prohibited."
+        )
+
+    def __add__(self, b: "FieldVector") -> "FieldVector":
+        if not isinstance(b, FieldVector):
+            raise FieldException("Addition is only defined between two FieldVector instances.")
+        lhs, rhs = self._coerce(b)
+        field = lhs.field
+        if isinstance(field, Field):
+            p = field.p
+            return FieldVector(field, [(x + y) % p for x, y in zip(lhs.residues, rhs.residues)])
+        add = field.add_raw
+        return FieldVector(field, [add(x, y) for x, y in zip(lhs.residues, rhs.residues)])
+
+    def __sub__(self, b: "FieldVector") -> "FieldVector":
+        if not isinstance(b, FieldVector):
+            raise FieldException("Subtraction is only defined between two FieldVector instances.")
+        lhs, rhs = self._coerce(b)
+        field = lhs.field
+        if isinstance(field, Field):
+            p = field.p
+            return FieldVector(field, [(x - y) % p for x, y in zip(lhs.residues, rhs.residues)])
+        sub = field.sub_raw
+        return FieldVector(field, [sub(x, y) for x, y in zip(lhs.residues, rhs.residues)])
+
+    def __neg__(self) -> "FieldVector":
+        if isinstance(self.field, Field):
+            p = self.field.p
+            return FieldVector(self.field, [-x % p for x in self.residues])
+        neg = self.field.neg_raw
+        return FieldVector(self.field, [neg(x) for x in self.residues])
+
+    def __mul__(self, b: "FieldVector | FieldElement") -> "FieldVector":
+        if isinstance(b, FieldElement):
+            if b.field is self.field:
+                c = b.value
+                if isinstance(self.field, Field):
+                    p = self.field.p
+                    return FieldVector(self.field, [x * c % p for x in self.residues])
+                mul = self.field.mul_raw
+                return FieldVector(self.field, [mul(x, c) for x in self.residues])
+            if getattr(b.field, "base", None) is self.field:
+                return self.lift(b.field) * b
+            if getattr(self.field, "base", None) is b.field:
+                scale = self.field.scale_raw
+                return FieldVector(self.field, [scale(x, b.value) for x in self.residues])
+            raise FieldException(
+                "Operations between terms from different fields are prohibited."
+            )
+        if isinstance(b, FieldVector):
+            lhs, rhs = self._coerce(b)
+            field = lhs.field
+            if isinstance(field, Field):
+                p = field.p
+                return FieldVector(field, [x * y % p for x, y in zip(lhs.residues, rhs.residues)])
+            mul = field.mul_raw
+            return FieldVector(field, [mul(x, y) for x, y in zip(lhs.residues, rhs.residues)])
+        raise FieldException(
+            "FieldVector can only be multiplied by a FieldVector or a FieldElement."
+        )
+
+    def __rmul__(self, b: "FieldElement") -> "FieldVector":
+        return self.__mul__(b)
+
+    def __pow__(self, exp: "int") -> "FieldVector":
+        if exp < 0:
+            return self.inverse() ** -exp
+        if isinstance(self.field, Field):
+            p = self.field.p
+            return FieldVector(self.field, [pow(x, exp, p) for x in self.residues])
+        pow_raw = self.field.pow_raw
+        return FieldVector(self.field, [pow_raw(x, exp) for x in self.residues])
+
+    def inverse(self) -> "FieldVector":
+        return FieldVector(self.field, self.field.batch_inverse_raw(self.residues))
+
+    def dot(self, b: "FieldVector") -> "FieldElement":
+        lhs, rhs = self._coerce(b)
+        field = lhs.field
+        if isinstance(field, Field):
+            return field.element(
+                sum(x * y for x, y in zip(lhs.residues, rhs.residues)) % field.p
+            )
+        acc = field.zero
+        for x, y in zip(lhs, rhs):
+            acc += x * y
+        return acc
@@ -1,22 +1,28 @@
 import math
 from hashlib import blake2b
-from utils.field import Field, FieldElement
+from itertools import islice
+from utils.field import Field, FieldElement, FieldVector
+from utils.domain import Domain
 from utils.proof_stream import ProofStream
 class Fri:
 
-    def __init__(self, omega, domain_length, offset, number_of_colinearity_tests, expansion_factor):
+    def __init__(self, omega, domain_length, offset, number_of_colinearity_tests, expansion_factor, folding_factor=2):
         self.omega = omega
         self.offset = offset
         self.field = omega.field
         self.domain_length = domain_length
         self.number_of_colinearity_tests = number_of_colinearity_tests
         self.expansion_factor = expansion_factor
+        self.folding_factor = folding_factor
 
     def num_rounds( self ):
+        # Fold until the codeword is down to a constant (length <= expansion
+        # factor) or too short for distinct colinearity tests; what is left is
+        # sent as a polynomial.
         codeword_length = self.domain_length
         num_rounds = 0
         while codeword_length > self.expansion_factor and 4*self.number_of_colinearity_tests < codeword_length:
-            codeword_length = codeword_length/2
+            codeword_length = codeword_length // self.folding_factor
             num_rounds += 1
         return num_rounds
     
@@ -29,3 +35,204 @@ class Fri:
         proofstream.prover_communicating()
 
 
+class FoldingEngine:
+    """
+    Folds FRI codewords on raw residues, starting from a layer-0 domain
+    offset * g^i, i < N, with g of order N, by `factor` = m at every layer.
+    Layer k lives on offset^(m^k) * (g^(m^k))^i, whose inverses are
+    inverses_0[m^k * i] times offset^(1 - m^k): every layer reads a strided
+    view of the layer-0 table, and the scalar goes into the folding challenge.
+    The m points x * omega^t, t < m, folded together sit at i + t * N_k / m.
+    """
+
+    def __init__(self, domain: Domain, factor: int = 2):
+        if factor < 2 or factor & (factor - 1) or len(domain) % factor:
+            raise ValueError("The folding factor must be a power of two dividing the domain size.")
+        self.field = domain.values.field
+        self.size = len(domain)
+        self.factor = factor
+        self.generator = domain.generator
+        self.offset = domain.offset
+        self.values = domain.values.residues
+        # omega of order m, the same at every layer
+        self.omega = self.generator ** (self.size // factor)
+        # Only the first N/m points are ever used: the others are x * omega^t.
+        self.inverses = self.field.batch_inverse_raw(self.values[: self.size // factor])
+        # (1/m) * omega^(-t*s): coefficients of sum(x^s f_s(x^m)) from the m values
+        p = self.field.p
+        omega_inv = self.field.inv_raw(self.omega.value)
+        m_inv = self.field.inv_raw(factor)
+        self.inverse_dft = [
+            [m_inv * pow(omega_inv, t * s, p) % p for t in range(factor)] for s in range(factor)
+        ]
+
+    def domain(self, layer: int) -> Domain:
+        """Domain of `layer`, read off layer 0 rather than raised to m again."""
+        stride = self.factor**layer
+        values = FieldVector(self.field, self.values[::stride])
+        factor = self.offset ** (stride - 1)
+        if factor != self.field.one:
+            values = values * factor
+        return Domain(self.generator ** stride, values, self.offset ** stride)
+
+    def fold(self, codeword: FieldVector, alpha: FieldElement, layer: int) -> FieldVector:
+        """
+        f'(x^m) = sum(alpha^s * f_s(x^m)) where f(x) = sum(x^s * f_s(x^m)), for
+        the codeword of `layer`. For m = 2 this is
+        ((f(x) + f(-x)) + alpha * (f(x) - f(-x)) / x) / 2, in one pass over
+        the two halves.
+        """
+        if self.factor != 2:
+            return self._fold_coset_raw(codeword, alpha, layer)
+        field = self.field
+        p = field.p
+        half = len(codeword) // 2
+        stride = 1 << layer
+        f = codeword.residues
+        inverses = islice(self.inverses, 0, None, stride)
+        # alpha * offset^(1 - 2^k) / 2 and 1 / 2, both applied in the same pass
+        scale = field.pow_raw(self.offset.value, 1 - stride)
+        two_inv = field.two_inv_raw
+        ext = alpha.field
+        if ext is field:
+            c = alpha.value * scale * two_inv % p
+            return FieldVector(field, [
+                ((a + b) * two_inv + (a - b) * x_inv * c) % p
+                for a, b, x_inv in zip(f, islice(f, half, None), inverses)
+            ])
+        c = ext.scale_raw(alpha.value, scale * two_inv % p)
+        if codeword.field is field:
+            # Base codeword, extension challenge: the first coordinate also
+            # gets the (f(x) + f(-x)) / 2 term.
+            c0, rest = c[0], c[1:]
+            res = []
+            for a, b, x_inv in zip(f, islice(f, half, None), inverses):
+                v = (a - b) * x_inv % p
+                res.append((((a + b) * two_inv + c0 * v) % p,) + tuple(c_j * v % p for c_j in rest))
+            return FieldVector(ext, res)
+        mul_raw = ext.mul_raw
+        res = []
+        for a, b, x_inv in zip(f, islice(f, half, None), inverses):
+            v = mul_raw(c, tuple((a_j - b_j) * x_inv % p for a_j, b_j in zip(a, b)))
+            res.append(tuple(((a_j + b_j) * two_inv + v_j) % p for a_j, b_j, v_j in zip(a, b, v)))
+        return FieldVector(ext, res)
+
+    def _fold_coset_raw(self, codeword: FieldVector, alpha: FieldElement, layer: int) -> FieldVector:
+        # Point j of the next layer gathers v_t = f(x * omega^t) at j + t * N_k / m.
+        # The inverse DFT of size m gives d_s = x^s * f_s(x^m), and
+        # sum(alpha^s * f_s(x^m)) = sum(d_s * (alpha / x)^s) by Horner.
+        field = self.field
+        p = field.p
+        m = self.factor
+        h = len(codeword) // m
+        stride = m**layer
+        f = codeword.residues
+        rows = zip(*(f[t * h : (t + 1) * h] for t in range(m)))
+        inverses = self.inverses[::stride]
+        dft = self.inverse_dft[::-1]
+        scale = field.pow_raw(self.offset.value, 1 - stride)
+        ext = alpha.field
+        if ext is field:
+            a = alpha.value * scale % p
+            res = []
+            for v, x_inv in zip(rows, inverses):
+                z = a * x_inv % p
+                acc = 0
+                for coefs in dft:
+                    acc = (acc * z + sum(c * v_t for c, v_t in zip(coefs, v))) % p
+                res.append(acc)
+            return FieldVector(field, res)
+        a = ext.scale_raw(alpha.value, scale)
+        mul_raw, add_raw, lift_raw = ext.mul_raw, ext.add_raw, ext.lift_raw
+        base = codeword.field is field
+        res = []
+        for v, x_inv in zip(rows, inverses):
+            z = ext.scale_raw(a, x_inv)
+            acc = None
+            for coefs in dft:
+                if base:
+                    d = lift_raw(sum(c * v_t for c, v_t in zip(coefs, v)) % p)
+                else:
+                    d = tuple(sum(c * v_t[i] for c, v_t in zip(coefs, v)) % p for i in range(ext.degree))
+                acc = d if acc is None else add_raw(mul_raw(acc, z), d)
+            res.append(acc)
+        return FieldVector(ext, res)
+
+    @staticmethod
+    def fold_coset(
+        values: "list[FieldElement]", x: FieldElement, omega: FieldElement, alpha: FieldElement
+    ) -> FieldElement:
+        """
+        Folded value at x^m from the m values f(x * omega^t), omega of order m:
+        what a verifier recomputes from one opened coset.
+        """
+        field = x.field
+        m = len(values)
+        omega_inv = field.one / omega
+        m_inv = field.one / field.element(m)
+        z = alpha * (field.one / x)
+        acc = None
+        for s in reversed(range(m)):
+            step = omega_inv**s
+            d = values[0] * m_inv
+            w = m_inv
+            for v in values[1:]:
+                w = w * step
+                d = d + v * w
+            acc = d if acc is None else acc * z + d
+        return acc  # type: ignore
+
+
+
+if __name__ == "__main__":
+    import random
+
+    def test_folding():
+        field = Field.main()
+        rng = random.Random(0)
+        n = 32
+        domain = Domain.generate_domain(field.primitive_nth_root(n), n).offset_domain(field.generator())
+        engine = FoldingEngine(domain)
+        codeword = FieldVector(field, [rng.randrange(field.p) for _ in range(n)])
+        for layer in range(3):
+            alpha = field.element(rng.randrange(field.p))
+            half = len(codeword) // 2
+            f_x, f_minus_x = codeword[:half], codeword[half:]
+            x_inv = domain.values[:half].inverse()
+            expected = ((f_x + f_minus_x) + (f_x - f_minus_x) * x_inv * alpha) * field.two_inv
+            codeword = engine.fold(codeword, alpha, layer)
+            domain = domain.sq_domain()
+            assert codeword == expected and engine.domain(layer + 1).values == domain.values
+
+    def test_higher_arity():
+        from utils.extension_field import ExtensionField
+        from utils.polynomial import Polynomial
+
+        field = Field.goldilocks()
+        ext = ExtensionField(field, 2)
+        rng = random.Random(1)
+        n = 64
+        start = Domain.generate_domain(field.primitive_nth_root(n), n).offset_domain(field.generator())
+        for factor in (4, 8):
+            engine = FoldingEngine(start, factor)
+            poly = Polynomial([field.element(rng.randrange(field.p)) for _ in range(n // 4)])
+            codeword = poly.evaluate_domain(start)
+            for layer, challenge_field in enumerate((field, ext)):
+                alpha = challenge_field.sample(rng.randbytes(32))
+                # f = sum(X^s f_s(X^m)) folds to sum(alpha^s f_s)
+                folded_poly = Polynomial.zero(challenge_field)
+                for s in range(factor):
+                    f_s = Polynomial.from_residues(poly.field, poly.residues[s::factor])
+                    folded_poly = folded_poly + f_s * alpha**s
+                domain = engine.domain(layer)
+                next_domain = engine.domain(layer + 1)
+                folded = engine.fold(codeword, alpha, layer)
+                assert folded == folded_poly.evaluate_domain(next_domain)
+                h = len(codeword) // factor
+                j = rng.randrange(h)
+                coset = [codeword[j + t * h] for t in range(factor)]
+                assert FoldingEngine.fold_coset(coset, domain.values[j], engine.omega, alpha) == folded[j]
+                poly, codeword = folded_poly, folded
+
+    test_folding()
+    test_higher_arity()
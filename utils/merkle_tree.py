@@ -1,164 +1,260 @@
-from typing import Self
-from typing import Callable, List, Tuple, Optional
-from typing import TypeVar, Generic
-
-
-T = TypeVar("T")
-
-
-class Node(Generic[T]):
-    def __init__(self, left: Optional["Node"], right: Optional["Node"], value: T):
-        self.value: "T" = value
-        self.left: Optional["Node"] = left
-        self.right: Optional["Node"] = right
-        self.parent: Optional["Node"] = None
-
-    def get_val(self) -> "T":
-        return self.value
-
-    def get_left(self) -> Optional["Node"]:
-        return self.left
-
-    def get_right(self) -> Optional["Node"]:
-        return self.right
-
-    def set_parent(self, parent: "Node[T]"):
-        self.parent = parent
-
-    def get_sibling(self) -> "tuple[bool, Node]":
-        if self.parent == None:
-            raise ValueError("Cannot get sibling of root node")
-        return self.parent.get_other_child(
-            self
-        )  # right sibling if False, left sibling if True
-
-    def get_other_child(self, child: "Node") -> "tuple[bool, Node]":
-        if self.left is None or self.right is None:
-            raise ValueError("Cannot get sibling of a leaf node")
-
-        if self.left == child:
-            return (False, self.right)  # right child if False, left child if True
-        return (True, self.left)
-
-
-class Leaf(Node[T]):
-    def __init__(self, value: "T"):
-        super().__init__(None, None, value)
-
-
-class BinaryTree(Generic[T]):
-    def __init__(self, leaves: list[T], combine: Callable[[T, T], T]):
-        self.n: "int" = len(leaves)
-        self.leaves: "list[Node]" = [Leaf(value) for value in leaves]
-        self.combine: Callable = combine
-        self.root: "Node" = BinaryTree.construct_tree(self.leaves.copy(), combine)
-
-    @staticmethod
-    def construct_tree(leaves: "list[Node]", combine: Callable[[T, T], T]) -> Node:
-        # I like the iterative version, but teach Come the recursive version as well
-
+from typing import Callable
+
+
+class MerkleTree:
+    """
+    Merkle tree over byte strings, with every digest in one flat bytearray in
+    heap layout: node 1 is the root, the children of node k are 2k and 2k + 1,
+    and leaf i sits at size + i. Node k occupies bytes [k * 32, (k + 1) * 32),
+    so the two children of a node are already the contiguous left || right
+    that gets hashed. Leaves are hashed once from their encoding, and the
+    leaf count is padded to a power of two `size` by repeating the last leaf.
+    Leaf and node hashes are prefixed with distinct tags, so the 64 bytes
+    of an inner node's children cannot be opened as a leaf.
+
+    With cap_height = k > 0 the commitment is the cap of the 2^k nodes at
+    depth k, nodes [2^k, 2^(k+1)), and paths stop there: k digests shorter,
+    for 2^k - 1 more in the commitment.
+    """
+
+    DIGEST_SIZE = 32
+    LEAF_TAG = b"\x00"
+    NODE_TAG = b"\x01"
+
+    def __init__(self, leaves: "list[bytes]", hash: Callable[[bytes], bytes], cap_height: int = 0):
         if len(leaves) == 0:
             raise ValueError("Cannot construct a tree with no leaves")
+        d = MerkleTree.DIGEST_SIZE
+        self.n = len(leaves)
+        self.size = 1 << (self.n - 1).bit_length()
+        self.hash = hash
+        self.cap_height = MerkleTree.clamp_cap_height(self.n, cap_height)
+        digests = [hash(MerkleTree.LEAF_TAG + leaf) for leaf in leaves]
+        digests += [digests[-1]] * (self.size - self.n)
+        nodes = bytearray(self.size * d) + b"".join(digests)
+        view = memoryview(nodes)
+        # One level at a time, from the leaves up: the digests of level
+        # [width, 2 * width) hash pairwise into [width / 2, width).
+        width = self.size
+        while width > 1:
+            nodes[width // 2 * d : width * d] = b"".join(
+                [hash(MerkleTree.NODE_TAG + view[k : k + 2 * d]) for k in range(width * d, 2 * width * d, 2 * d)]
+            )
+            width //= 2
+        view.release()
+        self.nodes = nodes
 
-        while len(leaves) > 1:
-            sequence_of_pairs = [(2 * i, 2 * i + 1) for i in range(len(leaves) // 2)]
-            storage = []
-            for tuple in sequence_of_pairs:
-
-                k, l = tuple
-                node = Node(
-                    leaves[k],
-                    leaves[l],
-                    combine(leaves[k].get_val(), leaves[l].get_val()),
-                )
-
-                leaves[k].set_parent(node)
-                leaves[l].set_parent(node)
-
-                storage.append(node)
-
-            if len(leaves) % 2:
-                storage.append(leaves[-1])
-            leaves = storage
-
-        return leaves[0]
-
-    def get_root(self):
-        return self.root
-
-    def get_sibling_path_to_root(self, node) -> "list[tuple[bool, Node]]":
+    @staticmethod
+    def clamp_cap_height(num_leaves: int, cap_height: int) -> int:
+        """Cap height actually used for `num_leaves` leaves: no deeper than the leaves."""
+        return min(cap_height, (num_leaves - 1).bit_length())
+
+    def node(self, k: int) -> bytes:
+        d = MerkleTree.DIGEST_SIZE
+        return bytes(self.nodes[k * d : (k + 1) * d])
+
+    def leaf(self, leaf_index: int) -> bytes:
+        return self.node(self.size + leaf_index)
+
+    def get_root(self) -> bytes:
+        return self.node(1)
+
+    def get_cap(self) -> "list[bytes]":
+        """The commitment: [root] without a cap, else the nodes at depth cap_height."""
+        width = 1 << self.cap_height
+        return [self.node(k) for k in range(width, 2 * width)]
+
+    def get_sibling_path_to_root(self, leaf_index: int) -> "list[tuple[bool, bytes]]":
+        # (True, sibling) when the sibling is the left child, up to the cap
+        if not 0 <= leaf_index < self.n:
+            raise IndexError("Leaf index out of bounds for MerkleTree.")
+        k = self.size + leaf_index
         path = []
-        while node.parent is not None:  # while node is not the root
-            is_left, sibling = node.get_sibling()
-            path.append((is_left, sibling))
-            node = node.parent
+        while k >> self.cap_height > 1:
+            path.append((k & 1 == 1, self.node(k ^ 1)))
+            k >>= 1
         return path
 
+    def open_many(self, leaf_indexes: "list[int]") -> "list[bytes]":
+        """
+        Multiproof for several leaves: going up level by level, the siblings
+        that cannot be recomputed from the opened leaves, in increasing node
+        order within each level. Shared upper nodes are sent at most once.
+        """
+        if not all(0 <= i < self.n for i in leaf_indexes):
+            raise IndexError("Leaf index out of bounds for MerkleTree.")
+        known = {self.size + i for i in leaf_indexes}
+        proof = []
+        cap = 1 << self.cap_height
+        while known and min(known) >= 2 * cap:
+            proof += [self.node(k ^ 1) for k in sorted(known) if k ^ 1 not in known]
+            known = {k >> 1 for k in known}
+        return proof
+
     @staticmethod
-    def recombine_path_node(
-        leaf_val: T, path: "list[tuple[bool, Node[T]]]", combine: Callable[[T, T], T]
-    ) -> T:
-        
-        path_list = list(map(lambda x: (x[0], x[1].get_val()), path))
-        return BinaryTree.recombine_path(leaf_val, path_list, combine)
-    
+    def verify_many(
+        leaves: "dict[int, bytes]",
+        proof: "list[bytes]",
+        root: "bytes | list[bytes]",
+        hash: Callable[[bytes], bytes],
+        num_leaves: int,
+        cap_height: int = 0,
+    ) -> bool:
+        """
+        Checks the leaves {index: encoding} of a tree of `num_leaves` leaves
+        against an open_many proof, hashing every node on the union of their
+        paths exactly once. `root` is the root or the cap, which must have
+        exactly the width given by `cap_height`.
+        """
+        cap = [root] if isinstance(root, bytes) else root
+        size = 1 << (num_leaves - 1).bit_length()
+        width = 1 << MerkleTree.clamp_cap_height(num_leaves, cap_height)
+        if not leaves or len(cap) != width:
+            return False
+        if not all(0 <= i < num_leaves for i in leaves):
+            return False
+        nodes = {size + i: hash(MerkleTree.LEAF_TAG + leaf) for i, leaf in leaves.items()}
+        siblings = iter(proof)
+        while min(nodes) >= 2 * width:
+            parents = {}
+            keys = sorted(nodes)
+            i = 0
+            while i < len(keys):
+                k = keys[i]
+                if k & 1 == 0 and i + 1 < len(keys) and keys[i + 1] == k + 1:
+                    left, right = nodes[k], nodes[k + 1]
+                    i += 2
+                else:
+                    sibling = next(siblings, None)
+                    if sibling is None:
+                        return False
+                    left, right = (sibling, nodes[k]) if k & 1 else (nodes[k], sibling)
+                    i += 1
+                parents[k >> 1] = hash(MerkleTree.NODE_TAG + left + right)
+            nodes = parents
+        return next(siblings, None) is None and all(cap[k - width] == v for k, v in nodes.items())
+
     @staticmethod
     def recombine_path(
-        leaf_val: T, path: "list[tuple[bool, T]]", combine: Callable[[T, T], T]
-    ) -> T:
-        curr_val = leaf_val
+        leaf: bytes, path: "list[tuple[bool, bytes]]", hash: Callable[[bytes], bytes]
+    ) -> bytes:
+        curr_val = hash(MerkleTree.LEAF_TAG + leaf)
         for is_left, sibling in path:
             if is_left:
-                curr_val = combine(sibling, curr_val)
+                curr_val = hash(MerkleTree.NODE_TAG + sibling + curr_val)
             else:
-                curr_val = combine(curr_val, sibling)
+                curr_val = hash(MerkleTree.NODE_TAG + curr_val + sibling)
         return curr_val
 
-
-class MerkleTree(Generic[T]):
-    def __init__(self, leaves: "list", hash: Callable[[T, T], T]):
-        self.n = len(leaves)
-        self.tree = BinaryTree(leaves, hash)
-        self.leaves = self.tree.leaves
-
-    def get_root(self) -> Node[T]:
-        return self.tree.get_root()
-
-    def get_sibling_path_to_root(self, leaf_index: int) -> "list[tuple[bool, T]]":
-        return list(
-            map(
-                lambda x: (x[0], x[1].value),
-                self.tree.get_sibling_path_to_root(self.leaves[leaf_index]),
-            )
-        )
-        
     @staticmethod
     def verify_path(
-        leaf_val: T, path: "list[tuple[bool, T]]", root_val: T, combine: Callable[[T, T], T]
+        leaf: bytes,
+        path: "list[tuple[bool, bytes]]",
+        root: "bytes | list[bytes]",
+        hash: Callable[[bytes], bytes],
+        leaf_index: "int | None" = None,
     ) -> bool:
-
-        recombined_value = BinaryTree.recombine_path(leaf_val, path, combine)
-        return recombined_value == root_val
+        # Against a cap, the path ends at entry leaf_index >> len(path)
+        if isinstance(root, bytes):
+            cap, leaf_index = [root], 0
+        elif leaf_index is None:
+            raise ValueError("Verifying a path against a cap needs the leaf index.")
+        else:
+            cap = root
+        cap_index = leaf_index >> len(path)
+        if cap_index >= len(cap):
+            return False
+        recombined_value = MerkleTree.recombine_path(leaf, path, hash)
+        return recombined_value == cap[cap_index]
 
 
 if __name__ == "__main__":
+    import hashlib
 
-    def path_test(leaves, combine):
-        tree = BinaryTree(leaves, combine)
-        root = tree.get_root()
-
-        for leaf in tree.leaves:
-            path = tree.get_sibling_path_to_root(leaf)
-            recombined_value = BinaryTree.recombine_path(leaf.get_val(), path, combine)
-            assert (
-                recombined_value == root.get_val()
-            ), f"Recombined value {recombined_value} does not match root value {root.get_val()} for leaf {leaf.get_val()}"
+    def sha256(data):
+        return hashlib.sha256(data).digest()
 
-    def combine_int(a, b):  # commutative
-        return a + b
+    def blake2b(data):
+        return hashlib.blake2b(data, digest_size=32).digest()
 
-    def combine_str(a, b):  # not commutative
-        return a + b
+    def path_test(leaves, hash):
+        tree = MerkleTree(leaves, hash)
+        root = tree.get_root()
 
-    path_test([1, 2, 3, 4, 5, 6], combine_int)
-    path_test(["a", "b", "c", "d", "e", "f"], combine_str)
+        for i, leaf in enumerate(leaves):
+            path = tree.get_sibling_path_to_root(i)
+            recombined_value = MerkleTree.recombine_path(leaf, path, hash)
+            assert (
+                recombined_value == root
+            ), f"Recombined value {recombined_value.hex()} does not match root value {root.hex()} for leaf {leaf}"
+            assert MerkleTree.verify_path(leaf, path, root, hash)
+            # Siblings cannot be swapped: left || right is not right || left
+            swapped = [(not is_left, sibling) for is_left, sibling in path]
+            assert not path or not MerkleTree.verify_path(leaf, swapped, root, hash)
+
+    for hash in (sha256, blake2b):
+        path_test([bytes([i]) for i in range(1, 7)], hash)
+        path_test([b"a", b"b", b"c", b"d", b"e", b"f"], hash)
+        path_test([b"a"], hash)
+        a, b, c = (hash(b"\x00" + leaf) for leaf in (b"a", b"b", b"c"))
+        root = hash(b"\x01" + hash(b"\x01" + a + b) + hash(b"\x01" + c + c))
+        assert MerkleTree([b"a", b"b", b"c"], hash).get_root() == root
+        # Two inner children opened as one leaf, one level up
+        t = MerkleTree([b"a", b"b", b"c", b"d"], hash)
+        assert not MerkleTree.verify_path(t.node(2) + t.node(3), [], t.get_root(), hash)
+        assert not MerkleTree.verify_many({0: t.node(2) + t.node(3)}, [], t.get_root(), hash, 1)
+
+    def multiproof_test(hash):
+        import random
+
+        rng = random.Random(0)
+        leaves = [rng.randbytes(16) for _ in range(100)]
+        tree = MerkleTree(leaves, hash)
+        root = tree.get_root()
+        for count in (1, 2, 7, 40, 100):
+            indexes = rng.sample(range(len(leaves)), count)
+            proof = tree.open_many(indexes)
+            # Never more digests than the separate paths put together
+            assert len(proof) <= sum(len(tree.get_sibling_path_to_root(i)) for i in indexes)
+            opened = {i: leaves[i] for i in indexes}
+            assert MerkleTree.verify_many(opened, proof, root, hash, len(leaves))
+            wrong = dict(opened)
+            wrong[indexes[0]] = b"x"
+            assert not MerkleTree.verify_many(wrong, proof, root, hash, len(leaves))
+            assert not MerkleTree.verify_many(opened, proof[:-1], root, hash, len(leaves))
+        assert MerkleTree(leaves[:64], hash).open_many(list(range(64))) == []
+
+    multiproof_test(sha256)
+
+    def cap_test(hash):
+        leaves = [bytes([i]) for i in range(20)]
+        full = MerkleTree(leaves, hash)
+        for cap_height in (0, 1, 3, 5, 9):
+            tree = MerkleTree(leaves, hash, cap_height)
+            cap = tree.get_cap()
+            assert len(cap) == 1 << min(cap_height, 5)
+            for i, leaf in enumerate(leaves):
+                path = tree.get_sibling_path_to_root(i)
+                assert path == full.get_sibling_path_to_root(i)[: len(path)]
+                assert len(path) == 5 - tree.cap_height
+                assert MerkleTree.verify_path(leaf, path, cap, hash, i)
+                assert len(cap) == 1 or not MerkleTree.verify_path(leaf, path, cap, hash, i ^ (1 << len(path)))
+            indexes = [0, 3, 17, 18]
+            proof = tree.open_many(indexes)
+            opened = {i: leaves[i] for i in indexes}
+            assert MerkleTree.verify_many(opened, proof, cap, hash, len(leaves), cap_height)
+            assert len(cap) == 1 or not MerkleTree.verify_many(opened, proof, cap[::-1], hash, len(leaves), cap_height)
+            # The cap width is the verifier's, not whatever the prover sends
+            assert len(cap) == 1 or not MerkleTree.verify_many(opened, proof, cap, hash, len(leaves))
+        # Every leaf digest as the "cap", with an empty proof
+        all_leaves = MerkleTree(leaves, hash, 5)
+        assert all_leaves.open_many([0, 3]) == []
+        assert not MerkleTree.verify_many({0: leaves[0], 3: leaves[3]}, [], all_leaves.get_cap(), hash, len(leaves), 2)
+        try:
+            MerkleTree.verify_path(leaves[0], [], all_leaves.get_cap(), hash)
+            assert False, "A path against a cap needs its leaf index"
+        except ValueError:
+            pass
+        assert MerkleTree(leaves, hash, 0).get_cap() == [full.get_root()]
+
+    cap_test(blake2b)
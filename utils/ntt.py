@@ -0,0 +1,319 @@
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+from utils.field import FieldElement, FieldVector
+
+
+# NTT engine: "radix2" runs the in-process iterative transform below, while
+# "four_step" switches transforms of at least FOUR_STEP_MIN_SIZE points to the
+# four-step algorithm, whose row and column batches go to WORKERS processes.
+ENGINE = "radix2"
+FOUR_STEP_MIN_SIZE = 1 << 16
+WORKERS = os.cpu_count() or 1
+
+# Twiddle tables, keyed by (p, n, generator): the generator fixes both the size
+# and the direction, the inverse transform using the inverse generator. At most
+# TWIDDLE_CACHE_SIZE tables are kept, the oldest evicted first, as any generator
+# can be passed in. Bit-reversal permutations only depend on n, a power of two.
+TWIDDLE_CACHE_SIZE = 16
+_twiddles: "dict[tuple[int, int, int], list[int]]" = {}
+_bit_reversals: "dict[int, list[int]]" = {}
+
+
+def twiddles_raw(generator: int, n: int, p: int) -> list[int]:
+    """[generator^i for i < n / 2], computed once per (p, n, generator)."""
+    key = (p, n, generator)
+    table = _twiddles.get(key)
+    if table is None:
+        table = [1] * (n // 2)
+        for i in range(1, n // 2):
+            table[i] = table[i - 1] * generator % p
+        if len(_twiddles) >= TWIDDLE_CACHE_SIZE:
+            _twiddles.pop(next(iter(_twiddles)))
+        _twiddles[key] = table
+    return table
+
+
+def bit_reversal(n: int) -> list[int]:
+    perm = _bit_reversals.get(n)
+    if perm is None:
+        perm = [0] * n
+        shift = n.bit_length() - 1
+        for i in range(1, n):
+            perm[i] = (perm[i >> 1] >> 1) | ((i & 1) << (shift - 1))
+        _bit_reversals[n] = perm
+    return perm
+
+
+def ntt_in_place(a: list[int], twiddles: list[int], p: int, scale: int = 1) -> None:
+    # Iterative Cooley-Tukey on a bit-reversed buffer, one layer of butterflies
+    # per block length. Each layer is run as list comprehensions, either block
+    # by block or, for the early layers with many short blocks, twiddle by
+    # twiddle over strided slices. `scale` is folded into the last layer.
+    n = len(a)
+    length = 2
+    while length <= n:
+        half = length // 2
+        step = n // length
+        last = length == n and scale != 1
+        if half <= step:
+            for j in range(half):
+                w = twiddles[j * step]
+                lo = a[j::length]
+                hi = a[j + half :: length]
+                t = [x * w % p for x in hi]
+                if last:
+                    a[j::length] = [(x + y) * scale % p for x, y in zip(lo, t)]
+                    a[j + half :: length] = [(x - y) * scale % p for x, y in zip(lo, t)]
+                else:
+                    a[j::length] = [(x + y) % p for x, y in zip(lo, t)]
+                    a[j + half :: length] = [(x - y) % p for x, y in zip(lo, t)]
+        else:
+            ws = twiddles[::step]
+            for start in range(0, n, length):
+                mid = start + half
+                lo = a[start:mid]
+                t = [x * w % p for x, w in zip(a[mid : start + length], ws)]
+                if last:
+                    a[start:mid] = [(x + y) * scale % p for x, y in zip(lo, t)]
+                    a[mid : start + length] = [(x - y) * scale % p for x, y in zip(lo, t)]
+                else:
+                    a[start:mid] = [(x + y) % p for x, y in zip(lo, t)]
+                    a[mid : start + length] = [(x - y) % p for x, y in zip(lo, t)]
+        length *= 2
+
+
+def ntt_raw(coeffs: list[int], generator: int, p: int, scale: int = 1) -> list[int]:
+    """Evaluations at generator^i, i < n, of the polynomial with these coefficients."""
+    n = len(coeffs)
+    if n <= 1:
+        return [c * scale % p for c in coeffs]
+    if ENGINE == "four_step" and n >= FOUR_STEP_MIN_SIZE:
+        return four_step_ntt_raw(coeffs, generator, p, scale, WORKERS)
+    a = [coeffs[i] for i in bit_reversal(n)]
+    ntt_in_place(a, twiddles_raw(generator, n, p), p, scale)
+    return a
+
+
+def ntt(coeffs: list[FieldElement], generator: FieldElement) -> list[FieldElement]:
+    n = len(coeffs)
+
+    # n must be a power of two.
+    if n > 0 and (n & (n - 1)) != 0:
+        raise ValueError("Length of coefficients list must be a power of two.")
+
+    field = generator.field
+    evals = ntt_raw([c.value for c in coeffs], generator.value, field.p)
+    return [field.element(v) for v in evals]
+
+
+def intt_raw(evals: list[int], generator: int, p: int) -> list[int]:
+    # Same transform with the inverse generator, the 1/n scaling fused in.
+    n = len(evals)
+    return ntt_raw(evals, pow(generator, p - 2, p), p, pow(n, p - 2, p))
+
+
+def intt(evals: list[FieldElement], generator: FieldElement) -> list[FieldElement]:
+
+    field = generator.field
+    coeffs = intt_raw([e.value for e in evals], generator.value, field.p)
+
+    return [field.element(c) for c in coeffs]
+
+
+def ntt_batch_raw(columns: list[list[int]], generator: int, p: int) -> list[list[int]]:
+    """ntt_raw of many columns of the same size, sharing the tables."""
+    return [ntt_raw(column, generator, p) for column in columns]
+
+
+def intt_batch_raw(columns: list[list[int]], generator: int, p: int) -> list[list[int]]:
+    if not columns:
+        return []
+    n = len(columns[0])
+    generator_inv = pow(generator, p - 2, p)
+    n_inv = pow(n, p - 2, p)
+    return [ntt_raw(column, generator_inv, p, n_inv) for column in columns]
+
+
+# Four-step (Bailey) NTT. With n = R * C, the input is read as the row-major
+# R x C matrix M[i1][i2] = a[C * i1 + i2], and
+#     X[k1 + R * k2] = sum_i2 g^(i2 * k1) (g^R)^(i2 * k2) sum_i1 M[i1][i2] (g^C)^(i1 * k1),
+# that is: size-R NTTs down the columns, a twiddle g^(i2 * k1), size-C NTTs
+# along the rows, and a transpose. The matrix lives in shared memory as
+# fixed-width little-endian residues, so each worker only receives a range of
+# columns or rows and writes its results back in place.
+
+
+def _read(buf, index: int, slot: int) -> int:
+    return int.from_bytes(buf[index * slot : (index + 1) * slot], "little")
+
+
+def _four_step_columns(name: str, slot: int, p: int, rows: int, cols: int, g: int, start: int, stop: int) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        root = pow(g, cols, p)
+        for i2 in range(start, stop):
+            column = [_read(buf, cols * i1 + i2, slot) for i1 in range(rows)]
+            column = _radix2(column, root, p)
+            w, twiddle = pow(g, i2, p), 1
+            for k1, c in enumerate(column):
+                index = (cols * k1 + i2) * slot
+                buf[index : index + slot] = (c * twiddle % p).to_bytes(slot, "little")
+                twiddle = twiddle * w % p
+    finally:
+        shm.close()
+
+
+def _four_step_rows(name: str, slot: int, p: int, rows: int, cols: int, g: int, start: int, stop: int) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        root = pow(g, rows, p)
+        for k1 in range(start, stop):
+            offset = k1 * cols
+            row = _radix2([_read(buf, offset + i2, slot) for i2 in range(cols)], root, p)
+            buf[offset * slot : (offset + cols) * slot] = b"".join(c.to_bytes(slot, "little") for c in row)
+    finally:
+        shm.close()
+
+
+def _radix2(coeffs: list[int], generator: int, p: int) -> list[int]:
+    a = [coeffs[i] for i in bit_reversal(len(coeffs))]
+    ntt_in_place(a, twiddles_raw(generator, len(coeffs), p), p)
+    return a
+
+
+# A single worker pool, reused across transforms: replaced when the worker
+# count changes and shut down at exit, so no worker processes are left behind.
+_pool: "ProcessPoolExecutor | None" = None
+_pool_workers = 0
+
+
+def _shutdown_pool() -> None:
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(_shutdown_pool)
+
+
+def _run(tasks: list[tuple], workers: int) -> None:
+    global _pool, _pool_workers
+    if workers <= 1:
+        for func, *args in tasks:
+            func(*args)
+        return
+    if _pool is None or _pool_workers != workers:
+        _shutdown_pool()
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    for future in [_pool.submit(*task) for task in tasks]:
+        future.result()
+
+
+def _ranges(total: int, parts: int) -> list[tuple[int, int]]:
+    step = -(-total // parts)
+    return [(start, min(start + step, total)) for start in range(0, total, step)]
+
+
+def four_step_ntt_raw(coeffs: list[int], generator: int, p: int, scale: int = 1, workers: int = 1) -> list[int]:
+    """Same output as ntt_raw, computed with the four-step algorithm over `workers` processes."""
+    n = len(coeffs)
+    rows = 1 << ((n.bit_length() - 1) // 2)
+    cols = n // rows
+    slot = (p.bit_length() + 7) // 8
+    shm = shared_memory.SharedMemory(create=True, size=n * slot)
+    try:
+        shm.buf[: n * slot] = b"".join(c.to_bytes(slot, "little") for c in coeffs)
+        _run(
+            [(_four_step_columns, shm.name, slot, p, rows, cols, generator, start, stop) for start, stop in _ranges(cols, workers)],
+            workers,
+        )
+        _run(
+            [(_four_step_rows, shm.name, slot, p, rows, cols, generator, start, stop) for start, stop in _ranges(rows, workers)],
+            workers,
+        )
+        data = bytes(shm.buf[: n * slot])
+    finally:
+        shm.close()
+        shm.unlink()
+    # Transpose on the way out: X[k1 + R * k2] sits at row k1, column k2.
+    out = [0] * n
+    for k1 in range(rows):
+        base = k1 * cols * slot
+        for k2 in range(cols):
+            c = int.from_bytes(data[base + k2 * slot : base + (k2 + 1) * slot], "little")
+            out[k1 + rows * k2] = c * scale % p if scale != 1 else c
+    return out
+
+
+def coset_lde_raw(columns: list[list[int]], offset: int, blowup: int, field) -> list[list[int]]:
+    # Low-degree extension of the evaluations of polynomials on a subgroup of
+    # size n to the coset offset * <h>, |<h>| = blowup * n: INTT on the subgroup,
+    # zero-padding, c_i -> c_i * offset^i, then one NTT of size blowup * n.
+    p = field.p
+    n = len(columns[0])
+    offset_powers = [1] * n
+    for i in range(1, n):
+        offset_powers[i] = offset_powers[i - 1] * offset % p
+    padding = [0] * ((blowup - 1) * n)
+    coeffs = [
+        [c * s % p for c, s in zip(column, offset_powers)] + padding
+        for column in intt_batch_raw(columns, field.primitive_nth_root(n).value, p)
+    ]
+    return ntt_batch_raw(coeffs, field.primitive_nth_root(blowup * n).value, p)
+
+
+def coset_lde(columns: list[list[FieldElement]] | list[FieldVector], offset: FieldElement, blowup: int) -> list[FieldVector]:
+    """
+    Extends every column, given by its values on the subgroup of its size, to
+    the coset `offset` * <h> with |<h>| = blowup * len(column).
+    """
+    n = len(columns[0])
+    if n & (n - 1) or blowup & (blowup - 1) or any(len(column) != n for column in columns):
+        raise ValueError("Columns must share a power-of-two length and blowup must be a power of two.")
+    field = offset.field
+    residues = [
+        column.residues if isinstance(column, FieldVector) else [e.value for e in column]
+        for column in columns
+    ]
+    return [FieldVector(field, column) for column in coset_lde_raw(residues, offset.value, blowup, field)]
+
+
+if __name__ == "__main__":
+    import random
+    from utils.field import Field
+
+    def test_ntt():
+        field = Field.main()
+        p = field.p
+        rng = random.Random(0)
+        for n in [1, 2, 4, 8, 64]:
+            g = field.primitive_nth_root(n).value
+            coeffs = [rng.randrange(p) for _ in range(n)]
+            naive = [sum(c * pow(g, i * j, p) for i, c in enumerate(coeffs)) % p for j in range(n)]
+            assert ntt_raw(coeffs, g, p) == naive
+            assert intt_raw(naive, g, p) == coeffs
+        columns = [[rng.randrange(p) for _ in range(16)] for _ in range(3)]
+        g = field.primitive_nth_root(16).value
+        assert intt_batch_raw(ntt_batch_raw(columns, g, p), g, p) == columns
+        for n in [2, 8, 32, 1024]:
+            g = field.primitive_nth_root(n).value
+            coeffs = [rng.randrange(p) for _ in range(n)]
+            assert four_step_ntt_raw(coeffs, g, p, 1, 2) == ntt_raw(coeffs, g, p)
+        # The twiddle cache stays bounded whatever generators come through
+        for k in range(2 * TWIDDLE_CACHE_SIZE):
+            twiddles_raw(pow(g, 2 * k + 1, p), n, p)
+        assert len(_twiddles) == TWIDDLE_CACHE_SIZE
+        # One pool, replaced when the worker count changes
+        pool = _pool
+        assert four_step_ntt_raw(coeffs, g, p, 1, 3) == ntt_raw(coeffs, g, p)
+        assert _pool is not pool and _pool_workers == 3
+        _shutdown_pool()
+        assert _pool is None
+
+    test_ntt()
@@ -1,33 +1,69 @@
 from utils.field import Field, FieldElement, MainFieldElement
+from utils.extension_field import ExtensionField
 import hashlib
 from utils.domain import Domain
 
 
 class GlobalParameters:
     main_field_prime = Field.main().p
-    log_2_size_of_group = 10 
+    field = Field.main()
+    # FRI challenges (and therefore folded codewords) live in this field. Small
+    # base fields need an extension here for the challenges to be sound.
+    challenge_field: Field | ExtensionField = field
+    log_2_size_of_group = 10
     size_of_group = 1 << log_2_size_of_group  # its easier if SIZE OF GROUP is a POWER OF 2
+    # FRI folds `folding_factor` points into one per round: log_m(size) rounds
+    folding_factor = 2
     num_rounds = log_2_size_of_group
     num_colinearity_tests = 20 # ensure that this is such that max_degree < 2 * num_colinearity_tests
-    
-        
+
+
     generator_int = 7
 
 
-    g = MainFieldElement(7) ** ((1 << (119 - log_2_size_of_group))) # generator
-    g = g ** 407
-    w = MainFieldElement(3)  # offset
+    g = field.primitive_nth_root(size_of_group) # generator
+    w = field.generator()  # offset
 
     group_domain = Domain.generate_domain(g, size_of_group)
     coset_domain = group_domain.offset_domain(w)
 
+    @classmethod
+    def use_field(cls, field: Field, extension_degree: int = 1) -> None:
+        """Rebuild the field-dependent parameters (generator, offset and domains) for `field`."""
+        cls.field = field
+        cls.challenge_field = field if extension_degree == 1 else ExtensionField(field, extension_degree)
+        cls.generator_int = field.generator().value
+        cls.g = field.primitive_nth_root(cls.size_of_group)
+        cls.w = field.generator()
+        cls.group_domain = Domain.generate_domain(cls.g, cls.size_of_group)
+        cls.coset_domain = cls.group_domain.offset_domain(cls.w)
+
+    @classmethod
+    def use_folding_factor(cls, factor: int) -> None:
+        """Fold by `factor` (a power of two) per FRI round, with as many rounds as fit in the group."""
+        if factor < 2 or factor & (factor - 1):
+            raise ValueError("The folding factor must be a power of two.")
+        cls.folding_factor = factor
+        cls.num_rounds = cls.log_2_size_of_group // (factor.bit_length() - 1)
+
+    # Commit to the 2^k Merkle nodes at depth k (a cap) instead of the root,
+    # which takes k digests off every authentication path. 0 commits the root.
+    merkle_cap_height = 0
+
+    # Commitment hash: "sha256" or "blake2b" (with a 32-byte digest)
+    hash_name = "sha256"
+    hash_functions = {
+        "sha256": hashlib.sha256,
+        "blake2b": lambda data: hashlib.blake2b(data, digest_size=32),
+    }
+
+    @classmethod
+    def use_hash(cls, name: str) -> None:
+        if name not in cls.hash_functions:
+            raise ValueError(f"Unknown hash function {name}, expected one of {list(cls.hash_functions)}.")
+        cls.hash_name = name
+
     @staticmethod
-    def hash_function(x: FieldElement | int) -> int:
-        if isinstance(x, FieldElement):
-            x = x.value
-        return int(hashlib.sha256(x.to_bytes(32, "big")).hexdigest(), 16)
-    
-    @staticmethod
-    def combine_hash(x: FieldElement | int, y: FieldElement | int) -> int:
-        return GlobalParameters.hash_function(x) ^ GlobalParameters.hash_function(y)
-    
+    def hash_function(data: bytes) -> bytes:
+        """32-byte digest of `data`: a leaf encoding, or left || right for an inner node."""
+        return GlobalParameters.hash_functions[GlobalParameters.hash_name](data).digest()
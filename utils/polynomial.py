@@ -1,5 +1,6 @@
-from utils.field import FieldElement, Field, MainFieldElement
+from utils.field import FieldElement, Field, FieldVector
 from utils.domain import Domain
+from utils.ntt import ntt_raw, intt_raw
 
 
 class PolynomialException(Exception):
@@ -11,7 +12,357 @@ class PolynomialException(Exception):
         return f"PolynomialException: {self.message}"
 
 
+def schoolbook_raw(lhs: "list[int]", rhs: "list[int]", p: "int") -> "list[int]":
+    prod = [0] * (len(lhs) + len(rhs) - 1)
+    for i, a_i in enumerate(lhs):
+        if a_i == 0:
+            continue
+        for j, b_j in enumerate(rhs):
+            prod[i + j] += a_i * b_j
+    return [c % p for c in prod]
+
+
+def karatsuba_raw(lhs: "list[int]", rhs: "list[int]", p: "int", threshold: "int") -> "list[int]":
+    if len(lhs) < len(rhs):
+        lhs, rhs = rhs, lhs
+    if len(rhs) <= threshold:
+        return schoolbook_raw(lhs, rhs, p)
+
+    m = (len(lhs) + 1) // 2
+    prod = [0] * (len(lhs) + len(rhs) - 1)
+    if len(rhs) <= m:
+        # Unbalanced operands: only split the longer one.
+        for shift, part in ((0, lhs[:m]), (m, lhs[m:])):
+            for i, c in enumerate(karatsuba_raw(part, rhs, p, threshold)):
+                prod[shift + i] += c
+        return [c % p for c in prod]
+
+    lhs_0, lhs_1 = lhs[:m], lhs[m:]
+    rhs_0, rhs_1 = rhs[:m], rhs[m:]
+    z0 = karatsuba_raw(lhs_0, rhs_0, p, threshold)
+    z2 = karatsuba_raw(lhs_1, rhs_1, p, threshold)
+    lhs_sum = list(lhs_0)
+    for i, c in enumerate(lhs_1):
+        lhs_sum[i] += c
+    rhs_sum = list(rhs_0)
+    for i, c in enumerate(rhs_1):
+        rhs_sum[i] += c
+    z1 = karatsuba_raw(lhs_sum, rhs_sum, p, threshold)
+
+    for i, c in enumerate(z0):
+        prod[i] += c
+        z1[i] -= c
+    for i, c in enumerate(z2):
+        prod[2 * m + i] += c
+        z1[i] -= c
+    for i, c in enumerate(z1):
+        if m + i < len(prod):
+            prod[m + i] += c
+    return [c % p for c in prod]
+
+
+def ntt_multiply_raw(lhs: "list[int]", rhs: "list[int]", field: "Field") -> "list[int]":
+    p = field.p
+    prod_len = len(lhs) + len(rhs) - 1
+    size = 1 << (prod_len - 1).bit_length()
+    root = field.primitive_nth_root(size).value
+    lhs_evals = ntt_raw(list(lhs) + [0] * (size - len(lhs)), root, p)
+    rhs_evals = ntt_raw(list(rhs) + [0] * (size - len(rhs)), root, p)
+    prod_evals = [a * b % p for a, b in zip(lhs_evals, rhs_evals)]
+    return intt_raw(prod_evals, root, p)[:prod_len]
+
+
+def kronecker_multiply_raw(lhs: "list[int]", rhs: "list[int]", p: "int") -> "list[int]":
+    # Kronecker substitution: pack each operand into one big int with fixed-width
+    # slots wide enough for any coefficient of the product (min(n, m) products
+    # of two residues), multiply once with CPython's C bignum code, then unpack.
+    slot_bits = 2 * (p - 1).bit_length() + min(len(lhs), len(rhs)).bit_length()
+    slot = (slot_bits + 7) // 8
+    lhs_int = int.from_bytes(b"".join(c.to_bytes(slot, "little") for c in lhs), "little")
+    rhs_int = int.from_bytes(b"".join(c.to_bytes(slot, "little") for c in rhs), "little")
+    prod_len = len(lhs) + len(rhs) - 1
+    packed = (lhs_int * rhs_int).to_bytes(prod_len * slot, "little")
+    return [
+        int.from_bytes(packed[i : i + slot], "little") % p
+        for i in range(0, prod_len * slot, slot)
+    ]
+
+
+def coset_parameters_raw(xs: "list[int]", field: "Field") -> "tuple[int, int] | None":
+    # Returns (offset, g) if xs == [offset * g^i for i < n] with g of order n,
+    # n a power of two, i.e. xs is a multiplicative subgroup or a coset of one.
+    p = field.p
+    n = len(xs)
+    if n < 2 or n & (n - 1) or xs[0] == 0:
+        return None
+    offset = xs[0]
+    g = xs[1] * field.inv_raw(offset) % p
+    if pow(g, n // 2, p) != p - 1:
+        return None
+    acc = offset
+    for x in xs:
+        if x != acc:
+            return None
+        acc = acc * g % p
+    return offset, g
+
+
+def inverse_series_raw(a: "list[int]", k: "int", field: "Field") -> "list[int]":
+    # Newton iteration for 1/a mod X^k, doubling the precision at each step:
+    # h <- h * (2 - a * h) mod X^(2 * prec).
+    p = field.p
+    inv = [field.inv_raw(a[0])]
+    prec = 1
+    while prec < k:
+        prec = min(2 * prec, k)
+        error = Polynomial.multiply_raw(a[:prec], inv, field)[:prec]
+        error = [-c % p for c in error] + [0] * (prec - len(error))
+        error[0] = (error[0] + 2) % p
+        inv = Polynomial.multiply_raw(inv, error, field)[:prec]
+    return inv
+
+
+def divmod_raw(f: "list[int]", g: "list[int]", field: "Field") -> "tuple[list[int], list[int]]":
+    # Quotient and remainder of f by g (trailing zeros allowed, g nonzero). Uses
+    # an O(n) pass for binomials a*X^m + b such as X^N - c, long division when
+    # the divisor or the quotient is short, and Newton inversion otherwise.
+    p = field.p
+    m = len(g) - 1
+    while m >= 0 and g[m] == 0:
+        m -= 1
+    if m == -1:
+        raise PolynomialException("Cannot divide by zero polynomial")
+    n = len(f) - 1
+    while n >= 0 and f[n] == 0:
+        n -= 1
+    if n < m:
+        return [0], list(f[: max(n + 1, 1)])
+
+    lead_inv = field.inv_raw(g[m])
+    if m > 0 and not any(g[1:m]):
+        b = g[0]
+        r = list(f[: n + 1])
+        q = [0] * (n - m + 1)
+        for i in range(n, m - 1, -1):
+            c = r[i] * lead_inv % p
+            q[i - m] = c
+            r[i - m] -= c * b
+        return q, [c % p for c in r[:m]] or [0]
+
+    if m <= Polynomial.DIVISION_THRESHOLD or n - m <= Polynomial.DIVISION_THRESHOLD:
+        r = list(f[: n + 1])
+        q = [0] * (n - m + 1)
+        for i in range(n, m - 1, -1):
+            c = r[i] % p * lead_inv % p
+            q[i - m] = c
+            if c:
+                for j in range(m):
+                    r[i - m + j] -= c * g[j]
+        return q, [c % p for c in r[:m]] or [0]
+
+    k = n - m + 1
+    rev_f = f[n::-1]
+    rev_g = g[m::-1]
+    q = Polynomial.multiply_raw(rev_f[:k], inverse_series_raw(rev_g, k, field), field)[:k]
+    q = q[::-1]
+    qg = Polynomial.multiply_raw(q, g[: m + 1], field)
+    return q, [(f[i] - qg[i]) % p for i in range(m)] or [0]
+
+
+def divide_by_linear_factors_raw(
+    f: "list[int]", roots: "list[int]", field: "Field"
+) -> "tuple[list[int], list[int]]":
+    # Divides by prod(X - a) with one O(n) synthetic division per root a. The
+    # remainder is rebuilt as r_1 + (X - a_1) r_2 + (X - a_1)(X - a_2) r_3 + ...
+    p = field.p
+    quotient = f[:]
+    remainder = [0] * max(len(roots), 1)
+    basis = [1]
+    for a in roots:
+        if len(quotient) == 1:
+            r, quotient = quotient[0], [0]
+        else:
+            q = [0] * (len(quotient) - 1)
+            acc = 0
+            for i in range(len(quotient) - 1, 0, -1):
+                acc = (acc * a + quotient[i]) % p
+                q[i - 1] = acc
+            r = (acc * a + quotient[0]) % p
+            quotient = q
+        for i, c in enumerate(basis):
+            remainder[i] = (remainder[i] + r * c) % p
+        basis = [(c_prev - a * c) % p for c_prev, c in zip([0] + basis, basis + [0])]
+    return quotient, remainder
+
+
+def compose_raw(f: "list[int]", g: "list[int]", field: "Field") -> "list[int]":
+    # f(g(X)) by divide and conquer: with h = 2^k >= len(f) / 2,
+    # f(g) = f_low(g) + g^h * f_high(g), the powers g^(2^i) being computed once.
+    # That is O(M(deg f * deg g) * log deg f) instead of deg f growing products.
+    p = field.p
+    powers = [list(g)]
+    while 1 << len(powers) < len(f):
+        powers.append(Polynomial.multiply_raw(powers[-1], powers[-1], field))
+
+    def compose(coefs, k):
+        if len(coefs) == 1:
+            return [coefs[0]]
+        half = 1 << (k - 1)
+        if len(coefs) <= half:
+            return compose(coefs, k - 1)
+        res = compose(coefs[:half], k - 1)
+        high = Polynomial.multiply_raw(compose(coefs[half:], k - 1), powers[k - 1], field)
+        for i in range(len(res)):
+            high[i] = (high[i] + res[i]) % p
+        return high
+
+    return compose(f, len(powers))
+
+
+def subproduct_tree_raw(xs: "list[int]", field: "Field") -> "list[list[list[int]]]":
+    # levels[0][i] = X - xs[i]; levels[k][i] = levels[k-1][2i] * levels[k-1][2i+1],
+    # an unpaired last node being carried up as is. levels[-1][0] vanishes on xs.
+    p = field.p
+    level = [[-x % p, 1] for x in xs]
+    levels = [level]
+    while len(level) > 1:
+        parents = [
+            Polynomial.multiply_raw(level[i], level[i + 1], field)
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+        level = parents
+    return levels
+
+
+def evaluate_tree_raw(f: "list[int]", levels: "list[list[list[int]]]", field: "Field") -> "list[int]":
+    # Multipoint evaluation: reduce f down the subproduct tree, f mod (X - x) = f(x).
+    rems = [divmod_raw(f, levels[-1][0], field)[1]]
+    for k in range(len(levels) - 1, 0, -1):
+        children = levels[k - 1]
+        next_rems = []
+        for i, rem in enumerate(rems):
+            for child in range(2 * i, min(2 * i + 2, len(children))):
+                next_rems.append(divmod_raw(rem, children[child], field)[1])
+        rems = next_rems
+    return [rem[0] if rem else 0 for rem in rems]
+
+
+def interpolate_tree_raw(
+    ys: "list[int]", levels: "list[list[list[int]]]", weights: "list[int]", field: "Field"
+) -> "list[int]":
+    # sum_i y_i * w_i * M(X) / (X - x_i) with barycentric weights w_i = 1 / M'(x_i),
+    # summed bottom-up along the subproduct tree of M.
+    p = field.p
+    polys = [[y * w % p] for y, w in zip(ys, weights)]
+    for k in range(1, len(levels)):
+        children = levels[k - 1]
+        merged = []
+        for i in range(0, len(polys) - 1, 2):
+            left = Polynomial.multiply_raw(polys[i], children[i + 1], field)
+            right = Polynomial.multiply_raw(polys[i + 1], children[i], field)
+            merged.append([(a + b) % p for a, b in zip(left, right)])
+        if len(polys) % 2:
+            merged.append(polys[-1])
+        polys = merged
+    return polys[0]
+
+
+class SubproductTree:
+    """
+    Subproduct tree of a point set over a prime field: the leaves are X - x_i
+    and every node is the product of its two children, so the node (level, i)
+    vanishes exactly on points [i * 2^level, (i + 1) * 2^level). It is built
+    once per point set and cached, and then serves multipoint evaluation,
+    interpolation and zerofiers for every polynomial on those points.
+    """
+
+    CACHE_SIZE = 16
+    _cache: "dict[tuple[Field, tuple[int, ...]], SubproductTree]" = {}
+
+    def __init__(self, field: "Field", xs: "list[int] | tuple[int, ...]"):
+        self.field = field
+        self.xs = tuple(xs)
+        self.levels = subproduct_tree_raw(self.xs, field)
+        self._weights: "list[int] | None" = None
+
+    @classmethod
+    def for_points(cls, points: "list[FieldElement] | FieldVector") -> "SubproductTree":
+        if not isinstance(points, FieldVector):
+            points = FieldVector.from_elements(points[0].field, points)
+        return cls.for_residues(points.field, points.residues)
+
+    @classmethod
+    def for_residues(cls, field: "Field", xs: "list[int] | tuple[int, ...]") -> "SubproductTree":
+        key = (field, tuple(xs))
+        tree = cls._cache.get(key)
+        if tree is None:
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.pop(next(iter(cls._cache)))
+            tree = cls._cache[key] = cls(field, key[1])
+        return tree
+
+    def __len__(self) -> "int":
+        return len(self.xs)
+
+    @property
+    def weights(self) -> "list[int]":
+        # Barycentric weights 1 / M'(x_i), M the root of the tree.
+        if self._weights is None:
+            p = self.field.p
+            root = self.levels[-1][0]
+            derivative = [i * root[i] % p for i in range(1, len(root))]
+            self._weights = self.field.batch_inverse_raw(self.evaluate_raw(derivative))
+        return self._weights
+
+    def evaluate_raw(self, f: "list[int]") -> "list[int]":
+        return evaluate_tree_raw(f, self.levels, self.field)
+
+    def interpolate_raw(self, ys: "list[int]") -> "list[int]":
+        return interpolate_tree_raw(ys, self.levels, self.weights, self.field)
+
+    def evaluate(self, poly: "Polynomial") -> "FieldVector":
+        return FieldVector(self.field, self.evaluate_raw(list(poly.residues) or [0]))
+
+    def interpolate(self, values: "list[FieldElement] | FieldVector") -> "Polynomial":
+        if not isinstance(values, FieldVector):
+            values = FieldVector.from_elements(self.field, values)
+        return Polynomial.from_residues(self.field, self.interpolate_raw(values.residues))
+
+    def zerofier(self, level: "int | None" = None, index: "int" = 0) -> "Polynomial":
+        """The node (level, index), by default the root, which vanishes on every point."""
+        level = len(self.levels) - 1 if level is None else level
+        return Polynomial.from_residues(self.field, self.levels[level][index])
+
+
 class Polynomial:
+    """
+    Immutable polynomial, stored as the tuple of its coefficient residues (ints,
+    or coefficient tuples over an ExtensionField), lowest degree first and
+    without trailing zeros, so the zero polynomial has no residues at all.
+    Operations never touch their operands and build each result in one buffer.
+    """
+
+    # Multiplication strategy over prime fields: "schoolbook", "karatsuba",
+    # "kronecker", "ntt", or "auto", which picks from the length of the shorter
+    # operand: schoolbook up to KRONECKER_THRESHOLD coefficients, Kronecker
+    # substitution up to NTT_THRESHOLD, then an NTT when the field has the
+    # needed roots of unity. Tuned with `python -m benchmarks.poly_mul`.
+    MULTIPLICATION = "auto"
+    KARATSUBA_THRESHOLD = 32  # Karatsuba falls back to schoolbook below this
+    KRONECKER_THRESHOLD = 8
+    NTT_THRESHOLD = 4096
+    # Division switches from long division to Newton inversion once both the
+    # divisor and the quotient have more coefficients than this.
+    DIVISION_THRESHOLD = 64
+    # Multipoint evaluation off a subgroup goes through a (cached) subproduct
+    # tree once both the points and the coefficients are at least this many.
+    TREE_THRESHOLD = 256
+
+    __slots__ = ("field", "residues", "_deg")
+
     def __init__(self, coef: "list[FieldElement]"):
         if len(coef) == 0:
             raise PolynomialException("Polynomials must have at least 1 coefficient.")
@@ -19,17 +370,40 @@ class Polynomial:
             raise PolynomialException(
                 "Coefficients of the polynomial must belong to the same field."
             )
-        self.coef = coef
-        self.field = self.coef[0].field
+        self._set(coef[0].field, [c.value for c in coef])
 
-    def deg(self) -> "int":
-        n = len(self.coef) - 1
-        while n >= 0 and self.coef[n].value == 0:
+    def _set(self, field, residues: "list") -> None:
+        zero = field.zero.value
+        n = len(residues)
+        while n > 0 and residues[n - 1] == zero:
             n -= 1
-        return n
+        object.__setattr__(self, "field", field)
+        object.__setattr__(self, "residues", tuple(residues[:n]) if n < len(residues) else tuple(residues))
+        object.__setattr__(self, "_deg", n - 1)
+
+    @classmethod
+    def from_residues(cls, field, residues: "list | tuple") -> "Polynomial":
+        """Wraps already reduced residues, trailing zeros allowed."""
+        poly = object.__new__(cls)
+        poly._set(field, residues)
+        return poly
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Polynomials are immutable.")
+
+    def __reduce__(self):
+        return (Polynomial.from_residues, (self.field, self.residues))
+
+    @property
+    def coef(self) -> "list[FieldElement]":
+        element = self.field.element
+        return [element(c) for c in self.residues] or [self.field.zero]
+
+    def deg(self) -> "int":
+        return self._deg
 
     def is_zero(self) -> "bool":
-        return self.deg() == -1
+        return self._deg == -1
 
     def __repr__(self) -> "str":
         return f"Polynomial(coef = {self.coef}, field = {self.field})"
@@ -39,155 +413,328 @@ class Polynomial:
             return "0"
         poly = ""
         for index, coef in enumerate(self.coef):
-            if coef.value != 0:
+            if not coef.is_zero():
                 if len(poly) != 0:
                     poly += " + "
                 if index == 0:
-                    poly += f"{coef.value}"
-                elif coef.value == 1:
+                    poly += f"{coef}"
+                elif coef == self.field.one:
                     poly += f"X^{index}"
                 else:
-                    poly += f"{coef.value}*X^{index}"
+                    poly += f"{coef}*X^{index}"
         return poly
 
+    def lift(self, field) -> "Polynomial":
+        """Promotes the coefficients into the extension field `field`."""
+        return Polynomial.from_residues(field, [field.lift_raw(c) for c in self.residues])
+
     @staticmethod
-    def synchro(a: "Polynomial", b: "Polynomial|FieldElement") -> "int":
+    def promote(a: "Polynomial", b: "Polynomial") -> "tuple[Polynomial, Polynomial]":
+        # Lifts whichever operand lives in the base field of the other one's extension.
+        if getattr(b.field, "base", None) is a.field:
+            return a.lift(b.field), b
+        if getattr(a.field, "base", None) is b.field:
+            return a, b.lift(a.field)
+        return a, b
 
-        if a.field != b.field:
-            raise PolynomialException(
-                "It makes no sense to synchronize two polynomials \
-                    with coefficients from different fields."
-            )
+    def _same_field(self, b: "Polynomial | FieldElement", operation: "str") -> "tuple[Polynomial, Polynomial]":
         if isinstance(b, FieldElement):
             b = Polynomial([b])
-        d = max(a.deg(), b.deg())
-        a.coef = a.coef[: a.deg() + 1]
-        b.coef = b.coef[: b.deg() + 1]
-        if len(a.coef) <= d:
-            a.coef = a.coef + (d + 1 - len(a.coef)) * [FieldElement(a.field, 0)]
-        if len(b.coef) <= d:
-            b.coef = b.coef + (d + 1 - len(b.coef)) * [FieldElement(b.field, 0)]
-        return d
+        lhs = self
+        if b.field is not lhs.field:
+            lhs, b = Polynomial.promote(lhs, b)
+            if b.field is not lhs.field:
+                raise PolynomialException(
+                    f"Impossible to {operation} polynomials linked to different fields."
+                )
+        return lhs, b
 
     def __eq__(self, b: object) -> "bool":
-
         if not isinstance(b, Polynomial):
-            return False
+            return NotImplemented
+        return self.field is b.field and self.residues == b.residues
 
-        if self.field == b.field:
-            Polynomial.synchro(self, b)
-            return self.coef == b.coef
-        return False
+    def __hash__(self) -> "int":
+        return hash((self.field, self.residues))
 
     def __add__(self, b: "Polynomial|FieldElement") -> "Polynomial":
-        if isinstance(b, FieldElement):
-            b = Polynomial([b])
-        if isinstance(b, Polynomial):
-            if b.field != self.field:
-                raise PolynomialException(
-                    "Impossible to sum multivariate polynomials linked to different fields."
-                )
-            if b.is_zero():
-                return self
-            d = Polynomial.synchro(self, b)
-            return Polynomial([self.coef[i] + b.coef[i] for i in range(d + 1)])
+        if not isinstance(b, (Polynomial, FieldElement)):
+            return NotImplemented
+        lhs, rhs = self._same_field(b, "sum")
+        a, b_ = lhs.residues, rhs.residues
+        if len(a) < len(b_):
+            a, b_ = b_, a
+        res = list(a)
+        field = lhs.field
+        if isinstance(field, Field):
+            p = field.p
+            for i, c in enumerate(b_):
+                res[i] = (res[i] + c) % p
         else:
-            print("Only polynomials or field elements can be added to polynomials.")
+            add_raw = field.add_raw
+            for i, c in enumerate(b_):
+                res[i] = add_raw(res[i], c)
+        return Polynomial.from_residues(field, res)
 
     def __radd__(self, b: "FieldElement"):
         return self.__add__(b)
 
     def __neg__(self) -> "Polynomial":
-        return Polynomial([-coef for coef in self.coef])
+        neg_raw = self.field.neg_raw
+        return Polynomial.from_residues(self.field, [neg_raw(c) for c in self.residues])
 
     def __sub__(self, b: "Polynomial|FieldElement") -> "Polynomial":
-        Polynomial.synchro(self, b)
-        return self.__add__(-b)
+        if not isinstance(b, (Polynomial, FieldElement)):
+            return NotImplemented
+        lhs, rhs = self._same_field(b, "subtract")
+        a, b_ = lhs.residues, rhs.residues
+        field = lhs.field
+        if isinstance(field, Field):
+            p = field.p
+            if len(a) >= len(b_):
+                res = list(a)
+                for i, c in enumerate(b_):
+                    res[i] = (res[i] - c) % p
+            else:
+                res = [-c % p for c in b_]
+                for i, c in enumerate(a):
+                    res[i] = (res[i] + c) % p
+        else:
+            sub_raw = field.sub_raw
+            zero = field.zero.value
+            n = max(len(a), len(b_))
+            res = [
+                sub_raw(a[i] if i < len(a) else zero, b_[i] if i < len(b_) else zero)
+                for i in range(n)
+            ]
+        return Polynomial.from_residues(field, res)
 
     def __rsub__(self, b: "FieldElement"):
-        return self.__sub__(b)
+        if not isinstance(b, FieldElement):
+            return NotImplemented
+        return Polynomial([b]) - self
 
     def __mul__(self, b: "Polynomial|FieldElement") -> "Polynomial":  # type: ignore
-        if isinstance(b, FieldElement):
-            b = Polynomial([b])
-        if isinstance(b, Polynomial):
-            try:
-                d = Polynomial.synchro(self, b)
-                if self.deg() == -1 or b.deg() == -1:
-                    return Polynomial.zero(self.field)
-                prod_coef = []
-                prod_deg = self.deg() + b.deg()
-                for k in range(prod_deg + 1):
-                    coef = FieldElement(self.field, 0)
-                    for i in range(max(k - d, 0), min(d, k) + 1):
-                        coef += self.coef[i] * b.coef[k - i]
-                    prod_coef.append(coef)
-                return Polynomial(prod_coef)
-            except PolynomialException as e:
-                raise PolynomialException(
-                    "Error during multiplication of polynomials"
-                ) from e
-        else:
-            raise TypeError(
-                "Polynomials can only be multiplied by polynomials or by field elements."
-            )
+        if not isinstance(b, (Polynomial, FieldElement)):
+            return NotImplemented
+        lhs, rhs = self._same_field(b, "multiply")
+        field = lhs.field
+        if lhs.is_zero() or rhs.is_zero():
+            return Polynomial.zero(field)
+        a, b_ = lhs.residues, rhs.residues
+        if not isinstance(field, Field):
+            mul_raw, add_raw = field.mul_raw, field.add_raw
+            prod = [field.zero.value] * (len(a) + len(b_) - 1)
+            for i, a_i in enumerate(a):
+                for j, b_j in enumerate(b_):
+                    prod[i + j] = add_raw(prod[i + j], mul_raw(a_i, b_j))
+            return Polynomial.from_residues(field, prod)
+        if len(b_) == 1:
+            p, c = field.p, b_[0]
+            return Polynomial.from_residues(field, [x * c % p for x in a])
+        return Polynomial.from_residues(field, Polynomial.multiply_raw(a, b_, field))
 
     def __rmul__(self, b: "FieldElement"):
         return self.__mul__(b)
 
+    @staticmethod
+    def multiply_raw(
+        lhs: "list[int]", rhs: "list[int]", field: "Field", method: "str | None" = None
+    ) -> "list[int]":
+        method = method or Polynomial.MULTIPLICATION
+        if method == "auto":
+            shortest = min(len(lhs), len(rhs))
+            if shortest <= Polynomial.KRONECKER_THRESHOLD:
+                method = "schoolbook"
+            elif shortest > Polynomial.NTT_THRESHOLD and field.has_nth_root(len(lhs) + len(rhs) - 1):
+                method = "ntt"
+            else:
+                method = "kronecker"
+        if method == "schoolbook":
+            return schoolbook_raw(lhs, rhs, field.p)
+        if method == "karatsuba":
+            return karatsuba_raw(lhs, rhs, field.p, Polynomial.KARATSUBA_THRESHOLD)
+        if method == "kronecker":
+            return kronecker_multiply_raw(lhs, rhs, field.p)
+        if method == "ntt":
+            return ntt_multiply_raw(lhs, rhs, field)
+        raise PolynomialException(f"Unknown multiplication method {method!r}.")
+
+    @staticmethod
+    def multiply(a: "Polynomial", b: "Polynomial", method: "str") -> "Polynomial":
+        """Product of two polynomials over the same prime field with an explicit strategy."""
+        if a.field is not b.field or not isinstance(a.field, Field):
+            raise PolynomialException(
+                "Explicit multiplication strategies need two polynomials over the same prime field."
+            )
+        if a.is_zero() or b.is_zero():
+            return Polynomial.zero(a.field)
+        return Polynomial.from_residues(
+            a.field, Polynomial.multiply_raw(a.residues, b.residues, a.field, method)
+        )
+
     def __truediv__(self, b: "FieldElement"):
         return self.__mul__(b ** (-1))  # type: ignore
 
     def __pow__(self, exp: "int") -> "Polynomial":
-        if exp == 0:
-            return Polynomial.one(self.field)
-        res = self
-        for _ in range(exp - 1):
-            res *= self
+        res = Polynomial.one(self.field)
+        base = self
+        while exp > 0:
+            if exp & 1:
+                res = res * base
+            exp >>= 1
+            if exp > 0:
+                base = base * base
         return res
 
     @classmethod
     def X(cls, field: Field):
-        return cls([field.zero, field.one])
+        return cls.from_residues(field, [field.zero.value, field.one.value])
+
+    def scale(self, c: "FieldElement") -> "Polynomial":
+        """p(c * X), in O(n) by multiplying the i-th coefficient by c^i."""
+        poly = self
+        if getattr(c.field, "base", None) is poly.field:
+            poly = poly.lift(c.field)
+        elif getattr(poly.field, "base", None) is c.field:
+            c = poly.field.lift(c)
+        field = poly.field
+        if c.field is not field:
+            raise PolynomialException(
+                "The polynomial and the scaling factor must belong to the same field."
+            )
+        res = [field.zero.value] * len(poly.residues)
+        if isinstance(field, Field):
+            p = field.p
+            power = 1
+            for i, coef in enumerate(poly.residues):
+                res[i] = coef * power % p
+                power = power * c.value % p
+        else:
+            power = field.one.value
+            for i, coef in enumerate(poly.residues):
+                res[i] = field.mul_raw(coef, power)
+                power = field.mul_raw(power, c.value)
+        return Polynomial.from_residues(field, res)
+
+    def compose(self, arg: "Polynomial") -> "Polynomial":
+        """p(q(X)): a scaling when q = c * X, divide and conquer otherwise."""
+        if self.field != arg.field:
+            raise PolynomialException(
+                "The polynomial and its argument must belong linked to the same field."
+            )
+        field = self.field
+        if self.deg() <= 0 or arg.deg() <= 0:
+            return Polynomial.from_residues(field, [self(arg.coef[0]).value])
+        if arg.deg() == 1 and arg.residues[0] == field.zero.value:
+            return self.scale(field.element(arg.residues[1]))
+        if isinstance(field, Field):
+            return Polynomial.from_residues(field, compose_raw(self.residues, arg.residues, field))
+        coef = self.coef
+        comp = Polynomial([coef[-1]])
+        for c in reversed(coef[:-1]):
+            comp = comp * arg + c
+        return comp
 
     def __call__(self, arg: "Polynomial|FieldElement"):
         if isinstance(arg, Polynomial):
-            if self.field != arg.field:
-                raise PolynomialException(
-                    "The polynomial and its argument must belong linked to the same field."
-                )
-            comp = Polynomial.zero(self.field)
-            for index, coef in enumerate(self.coef):
-                comp = comp + (arg**index) * coef
-            return comp
+            return self.compose(arg)
         if isinstance(arg, FieldElement):
+            if getattr(arg.field, "base", None) is self.field:
+                return self.lift(arg.field)(arg)
+            if getattr(self.field, "base", None) is arg.field:
+                arg = self.field.lift(arg)
             if self.field != arg.field:
                 raise PolynomialException(
                     "The polynomial and its argument must belong linked to the same field."
                 )
-            value = self.field.zero
-            for index, coef in enumerate(self.coef):
-                value += coef * (arg**index)  # type: ignore
-            return value
+            if not isinstance(self.field, Field):
+                mul_raw, add_raw = self.field.mul_raw, self.field.add_raw
+                value = self.field.zero.value
+                for c in reversed(self.residues):
+                    value = add_raw(mul_raw(value, arg.value), c)
+                return self.field.element(value)
+            p = self.field.p
+            x = arg.value
+            value = 0
+            for c in reversed(self.residues):
+                value = (value * x + c) % p
+            return self.field.element(value)
         else:
             raise PolynomialException(
                 "TypeError : the argument of the polynomials can only be \
                     a polynomial or a field element."
             )
 
-    def evaluate_domain(self, domain: Domain):
-        return [self(ele) for ele in domain.values]
+    def evaluate_many(self, points: "list[FieldElement] | FieldVector") -> FieldVector:
+        """
+        Evaluates the polynomial at every point: with an NTT when the points
+        form a power-of-two subgroup or a coset of one, down a subproduct tree
+        for other large point sets, by Horner otherwise.
+        """
+        if not isinstance(points, FieldVector):
+            if len(points) == 0:
+                return FieldVector(self.field, [])
+            points = FieldVector.from_elements(points[0].field, points)
+        field = points.field
+        if not isinstance(field, Field):
+            # Extension points: lift the polynomial and evaluate one by one.
+            poly = self if self.field is field else self.lift(field)
+            return FieldVector(field, [poly(x).value for x in points])
+        if self.field is not field and getattr(self.field, "base", None) is not field:
+            raise PolynomialException(
+                "The polynomial and its argument must belong linked to the same field."
+            )
+        xs = points.residues
+        if self.field is not field:
+            # Extension coefficients over base points: evaluation is linear in
+            # the coefficients, so evaluate each coordinate over the base field.
+            coordinates = [
+                Polynomial.evaluate_many_raw([c[k] for c in self.residues], xs, field)
+                for k in range(self.field.degree)
+            ]
+            return FieldVector(self.field, list(zip(*coordinates)))
+        return FieldVector(field, Polynomial.evaluate_many_raw(self.residues, xs, field))
+
+    @staticmethod
+    def evaluate_many_raw(coefs: "list[int]", xs: "list[int]", field: "Field") -> "list[int]":
+        p = field.p
+        n = len(xs)
+        coset = coset_parameters_raw(xs, field)
+        if coset is not None:
+            offset, g = coset
+            # P(offset * g^j) = sum_i (c_i * offset^i) g^(ij), folding i mod n.
+            folded = [0] * n
+            scale = 1
+            for i, c in enumerate(coefs):
+                folded[i % n] += c * scale
+                scale = scale * offset % p
+            return ntt_raw([c % p for c in folded], g, p)
+        if min(n, len(coefs)) >= Polynomial.TREE_THRESHOLD:
+            return SubproductTree.for_residues(field, xs).evaluate_raw(list(coefs))
+        # Batched Horner: one pass over the coefficients for all the points.
+        values = [0] * n
+        for c in reversed(coefs):
+            values = [(v * x + c) % p for v, x in zip(values, xs)]
+        return values
+
+    def evaluate_domain(self, domain: Domain) -> FieldVector:
+        return self.evaluate_many(domain.values)
 
     @staticmethod
     def zero(field: "Field") -> "Polynomial":
-        return Polynomial([FieldElement(field, 0)])
+        return Polynomial.from_residues(field, ())
 
     @staticmethod
     def one(field: "Field") -> "Polynomial":
-        return Polynomial([FieldElement(field, 1)])
+        return Polynomial.from_residues(field, (field.one.value,))
 
     @staticmethod
     def interpolate(x: "list[FieldElement]", y: "list[FieldElement]") -> "Polynomial":
+        if isinstance(x, FieldVector):
+            x = x.to_elements()
+        if isinstance(y, FieldVector):
+            y = y.to_elements()
         n = len(x)
         if n == 0:
             raise PolynomialException(
@@ -197,10 +744,53 @@ class Polynomial:
             raise PolynomialException(
                 "Abscissas and ordinates lists must have the same length."
             )
-        if not FieldElement.field_eq(x + y):
+        field = x[0].field
+        if not FieldElement.field_eq(x) or not FieldElement.field_eq(y) or (
+            y[0].field is not field and getattr(y[0].field, "base", None) is not field
+        ):
             raise PolynomialException(
                 "Abscissas and ordinates lists must belong to the same field."
             )
+        if not isinstance(field, Field):
+            return Polynomial.interpolate_lagrange(x, y)
+
+        xs = [x_i.value for x_i in x]
+        if y[0].field is not field:
+            # Extension ordinates over base abscissas: interpolation is linear
+            # in y, so interpolate each coordinate over the base field.
+            ext = y[0].field
+            coordinates = [
+                Polynomial.interpolate_raw(xs, [y_i.value[k] for y_i in y], field)
+                for k in range(ext.degree)
+            ]
+            return Polynomial.from_residues(ext, list(zip(*coordinates)))
+        return Polynomial.from_residues(
+            field, Polynomial.interpolate_raw(xs, [y_i.value for y_i in y], field)
+        )
+
+    @staticmethod
+    def interpolate_raw(xs: "list[int]", ys: "list[int]", field: "Field") -> "list[int]":
+        # A subgroup or a coset of one is an INTT away; any other point set goes
+        # through the subproduct tree.
+        coset = coset_parameters_raw(xs, field)
+        if coset is None:
+            return SubproductTree.for_residues(field, xs).interpolate_raw(ys)
+        p = field.p
+        offset, g = coset
+        coefs = intt_raw(ys, g, p)  # coefficients of P(offset * X)
+        if offset != 1:
+            offset_inv = field.inv_raw(offset)
+            scale = 1
+            for i in range(len(coefs)):
+                coefs[i] = coefs[i] * scale % p
+                scale = scale * offset_inv % p
+        return coefs
+
+    @staticmethod
+    def interpolate_lagrange(x: "list[FieldElement]", y: "list[FieldElement]") -> "Polynomial":
+        n = len(x)
+        if getattr(x[0].field, "base", None) is y[0].field:
+            y = [x[0].field.lift(y_i) for y_i in y]
         poly = Polynomial.zero(x[0].field)
         for i in range(n):
             product = Polynomial([y[i]])
@@ -211,31 +801,170 @@ class Polynomial:
                     )
             poly += product
         return poly
-    
+
     @staticmethod
     def divide(numerator: "Polynomial", denominator: "Polynomial") -> tuple["Polynomial", "Polynomial"]:
-        # Should only use for MainFieldElement
-        if denominator.deg() == -1:
+        if denominator.field is not numerator.field:
+            numerator, denominator = Polynomial.promote(numerator, denominator)
+            if denominator.field is not numerator.field:
+                raise PolynomialException("Cannot divide polynomials over different fields.")
+        field = numerator.field
+        if denominator.is_zero():
             raise PolynomialException("Cannot divide by zero polynomial")
         if numerator.deg() < denominator.deg():
-            return (Polynomial([MainFieldElement(0)]), numerator)
-    
-        remainder = Polynomial(numerator.coef.copy())
-        quotient_coefficients: list[FieldElement] = [MainFieldElement(0) for _ in range(numerator.deg() - denominator.deg() + 1)]
-        for _ in range(numerator.deg() - denominator.deg() + 1):
-            if remainder.deg() < denominator.deg():
-                break
-            coefficient = remainder.coef[remainder.deg()] / denominator.coef[denominator.deg()]
-            shift = remainder.deg() - denominator.deg()
-            subtractee = Polynomial([MainFieldElement(0)] * shift + [coefficient]) * denominator
-            quotient_coefficients[shift] = coefficient
-            remainder = remainder - subtractee
-        quotient = Polynomial(quotient_coefficients)
-        return quotient, remainder
-    
+            return (Polynomial.zero(field), numerator)
+
+        if isinstance(field, Field):
+            q, r = divmod_raw(numerator.residues, denominator.residues, field)
+            return Polynomial.from_residues(field, q), Polynomial.from_residues(field, r)
+
+        mul_raw, sub_raw = field.mul_raw, field.sub_raw
+        g = denominator.residues
+        m = denominator.deg()
+        lead_inv = field.inv_raw(g[m])
+        remainder = list(numerator.residues)
+        quotient = [field.zero.value] * (numerator.deg() - m + 1)
+        for i in range(numerator.deg(), m - 1, -1):
+            c = mul_raw(remainder[i], lead_inv)
+            quotient[i - m] = c
+            for j in range(m):
+                remainder[i - m + j] = sub_raw(remainder[i - m + j], mul_raw(c, g[j]))
+        return Polynomial.from_residues(field, quotient), Polynomial.from_residues(field, remainder[:m])
+
+    @staticmethod
+    def divide_by_linear_factors(
+        numerator: "Polynomial", roots: "list[FieldElement]"
+    ) -> tuple["Polynomial", "Polynomial"]:
+        """Quotient and remainder of `numerator` by prod(X - a) for a in `roots`, in O(n * len(roots))."""
+        field = numerator.field
+        if not isinstance(field, Field) or not all(a.field is field for a in roots):
+            return Polynomial.divide(
+                numerator, Polynomial.zerofier(roots) if roots else Polynomial.one(field)
+            )
+        q, r = divide_by_linear_factors_raw(
+            list(numerator.residues) or [0], [a.value for a in roots], field
+        )
+        return Polynomial.from_residues(field, q), Polynomial.from_residues(field, r)
+
+    @staticmethod
+    def zerofier(roots: "list[FieldElement]") -> "Polynomial":
+        """prod(X - a) for a in `roots`."""
+        poly = Polynomial.one(roots[0].field)
+        for a in roots:
+            poly = poly * (Polynomial.X(a.field) - a)
+        return poly
+
     def __mod__(self, other: object):
         if not isinstance(other, Polynomial):
-            raise PolynomialException(f"only take modulo with another poly")
-        
+            return NotImplemented
+
         _, rem = Polynomial.divide(self, other) # type: ignore
-        return rem
\ No newline at end of file
+        return rem
+
+    def __floordiv__(self, other: object):
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+
+        quotient, _ = Polynomial.divide(self, other)
+        return quotient
+
+if __name__ == "__main__":
+    import random
+
+    def test_interpolate():
+        field = Field.main()
+        rng = random.Random(0)
+
+        def rand():
+            return field.element(rng.randrange(field.p))
+
+        for n in [1, 2, 3, 8, 13]:
+            x, y = [rand() for _ in range(n)], [rand() for _ in range(n)]
+            poly = Polynomial.interpolate(x, y)
+            assert poly == Polynomial.interpolate_lagrange(x, y)
+            assert all(poly(x_i) == y_i for x_i, y_i in zip(x, y))
+
+        g = field.primitive_nth_root(16)
+        offset = field.generator()
+        for x in ([g**i for i in range(16)], [offset * g**i for i in range(16)]):
+            y = [rand() for _ in range(16)]
+            poly = Polynomial.interpolate(x, y)
+            assert poly.deg() < 16 and all(poly(x_i) == y_i for x_i, y_i in zip(x, y))
+
+    def test_evaluate_many():
+        field = Field.main()
+        rng = random.Random(1)
+        poly = Polynomial([field.element(rng.randrange(field.p)) for _ in range(40)])
+        g = field.primitive_nth_root(16)
+        offset = field.generator()
+        for points in (
+            [g**i for i in range(16)],
+            [offset * g**i for i in range(16)],
+            [field.element(rng.randrange(field.p)) for _ in range(10)],
+        ):
+            assert poly.evaluate_many(points) == FieldVector(field, [poly(x).value for x in points])
+        assert poly(Polynomial.X(field) * offset)(g) == poly(offset * g)
+
+    def test_divide():
+        field = Field.main()
+        rng = random.Random(2)
+
+        def rand_poly(n):
+            return Polynomial([field.element(rng.randrange(field.p)) for _ in range(n)])
+
+        for n, m in [(10, 3), (300, 200), (400, 100), (50, 1)]:
+            f, g = rand_poly(n), rand_poly(m)
+            q, r = Polynomial.divide(f, g)
+            assert q * g + r == f and r.deg() < g.deg()
+        f = rand_poly(200)
+        c = field.element(rng.randrange(field.p))
+        q, r = Polynomial.divide(f, Polynomial.X(field) ** 64 - c)
+        assert q * (Polynomial.X(field) ** 64 - c) + r == f and r.deg() < 64
+        roots = [field.element(rng.randrange(field.p)) for _ in range(4)]
+        q, r = Polynomial.divide_by_linear_factors(f, roots)
+        assert (q, r) == Polynomial.divide(f, Polynomial.zerofier(roots))
+
+    def test_value_semantics():
+        import pickle
+
+        field = Field.main()
+        a = Polynomial([field.element(3), field.element(1), field.zero])
+        b = Polynomial([field.element(5)])
+        residues = (a.residues, b.residues)
+        assert a.deg() == 1 and a + b - b == a and a * b - a * b == Polynomial.zero(field)
+        assert (a.residues, b.residues) == residues
+        assert pickle.loads(pickle.dumps(a)) == a
+        assert b.__rsub__(field.one) == Polynomial([field.element(field.p - 4)])
+
+    def test_compose():
+        field = Field.main()
+        rng = random.Random(3)
+
+        def rand_poly(n):
+            return Polynomial([field.element(rng.randrange(field.p)) for _ in range(n)])
+
+        f, c = rand_poly(50), field.element(rng.randrange(field.p))
+        x = field.element(rng.randrange(field.p))
+        assert f.scale(c)(x) == f(c * x) and f(Polynomial.X(field) * c) == f.scale(c)
+        for n, m in [(1, 5), (7, 3), (33, 2), (20, 20)]:
+            f, g = rand_poly(n), rand_poly(m)
+            assert f(g)(x) == f(g(x)) and f(g).deg() == f.deg() * g.deg()
+
+    def test_subproduct_tree():
+        field = Field.main()
+        rng = random.Random(4)
+        points = [field.element(rng.randrange(field.p)) for _ in range(13)]
+        tree = SubproductTree.for_points(points)
+        assert SubproductTree.for_points(points) is tree
+        poly = Polynomial([field.element(rng.randrange(field.p)) for _ in range(20)])
+        assert tree.evaluate(poly) == FieldVector(field, [poly(x).value for x in points])
+        assert tree.interpolate(tree.evaluate(poly)) == poly % tree.zerofier()
+        assert tree.zerofier() == Polynomial.zerofier(points)
+        assert tree.zerofier(2, 1) == Polynomial.zerofier(points[4:8])
+
+    test_interpolate()
+    test_evaluate_many()
+    test_divide()
+    test_value_semantics()
+    test_compose()
+    test_subproduct_tree()
@@ -1,7 +1,9 @@
-from utils.field import MainFieldElement, FieldElement, Field
+from utils.field import MainFieldElement, FieldElement, Field, FieldVector
 from utils.polynomial import Polynomial
 from utils.merkle_tree import MerkleTree
 from utils.state_machine import StateMachine
+from utils.fri import Fri, FoldingEngine
+from utils.params import GlobalParameters
 
 import random
 from utils.proof_stream import ProofStream
@@ -9,8 +11,8 @@ from utils.domain import Domain
 
 
 class ReedSolomonCode:
-    def __init__(self, values: list[FieldElement], max_degree_: int, domain: Domain):
-        self.values = values
+    def __init__(self, values: "list[FieldElement] | FieldVector", max_degree_: int, domain: Domain):
+        self.values = FieldVector.from_elements(domain.values.field, values) if isinstance(values, list) else values
         self.max_degree = max_degree_
         self.domain = domain
         self.p = None  # polynomial
@@ -26,7 +28,7 @@ class ReedSolomonCode:
         sampled_domain = [self.domain.values[i] for i in idx]
         self.p = Polynomial.interpolate(sampled_domain, sampled_values)
         print(f"Polynomial degree: {self.p.deg()}, expected max degree: {self.max_degree}")
-        return self.p.deg() <= self.max_degree and all(self.p(x) == self.values[i] for i, x in enumerate(self.domain.values))
+        return self.p.deg() <= self.max_degree and self.p.evaluate_many(self.domain.values) == self.values
 
     def poly_eval(self, x: FieldElement) -> FieldElement:
         if self.p == None:
@@ -34,6 +36,19 @@ class ReedSolomonCode:
 
         return self.p(x)  # type: ignore
 
+    def commit(self, factor: int) -> MerkleTree:
+        """
+        Merkle tree with one leaf per folding coset: leaf j holds the m = factor
+        values at j + t * N / m, t < m, so one path opens all of them.
+        """
+        h = len(self.values) // factor
+        encodings = self.values.to_bytes()
+        return MerkleTree(
+            [b"".join(encodings[j::h]) for j in range(h)],
+            GlobalParameters.hash_function,
+            GlobalParameters.merkle_cap_height,
+        )
+
     def __len__(self):
         return len(self.values)
 
@@ -51,170 +66,198 @@ class ReedSolomonCode:
         
 
 
+def num_folding_rounds(max_degree: int) -> int:
+    """Rounds folded before the rest is sent as a polynomial, by the Fri stopping rule."""
+    params = GlobalParameters
+    fri = Fri(
+        params.g,
+        params.size_of_group,
+        params.w,
+        params.num_colinearity_tests,
+        params.size_of_group // (max_degree + 1),
+        params.folding_factor,
+    )
+    # At least one round, or nothing would tie the final polynomial to the commitment.
+    return max(1, min(fri.num_rounds(), params.num_rounds))
+
+
 class Query:
     def __init__(
         self,
-        a_pair: tuple[FieldElement, FieldElement],
-        b_pair: tuple[FieldElement, FieldElement],
+        index: int,
+        x: FieldElement,
+        coset_values: list[FieldElement],
         c_pair: tuple[FieldElement, FieldElement],
-        proof_a: list[tuple[bool, int]],
-        proof_b: list[tuple[bool, int]],
-        proof_c: list[tuple[bool, int]],
     ):
-
-        self.a, self.f_a = a_pair
-        self.b, self.f_b = b_pair
+        # coset_values[t] = f(x * omega^t), at index + t * N / m, for the folding
+        # factor m = len(coset_values); for m = 2 these are f(a) and f(b) with
+        # a = x and b = -x. c = x^m is at `index` in the next codeword.
+        self.index = index
+        self.x = x
+        self.coset_values = coset_values
         self.c, self.c_f_star = c_pair
-        self.proof_a = proof_a
-        self.proof_b = proof_b
-        self.proof_c = proof_c
 
 
 class QueryGenerator:
 
-    def __init__(self, seed: int, curr_codeword, next_codeword):
-        self.seed = random.Random(seed)
-        num_to_sample = min(
-            len(next_codeword.domain), GlobalParameters.num_colinearity_tests
-        )
-        self.query_indexes = self.seed.sample(
-            range(len(next_codeword.domain)),
-            num_to_sample,
-        )  # sampling from 0 to N // 2 - 1
-
-        self.query_indexes.sort()
+    def __init__(self, query_indexes: list[int], curr_codeword, next_codeword):
+        self.query_indexes = query_indexes
         
         self.curr_codeword = curr_codeword
         self.next_codeword = next_codeword
 
-    def generate_query(
-        self, alpha, curr_merkle: MerkleTree[int], next_merkle: MerkleTree[int]
-    ) -> list[Query]:
+    @staticmethod
+    def sample_indexes(seed: bytes, num_points: int) -> list[int]:
+        """
+        Sorted first-layer query indexes in [0, N // m). `seed` is drawn from
+        the transcript once every layer and the final polynomial are
+        committed, so the prover cannot know the positions beforehand.
+        """
+        rng = random.Random(seed)
+        num_to_sample = min(num_points, GlobalParameters.num_colinearity_tests)
+        return sorted(rng.sample(range(num_points), num_to_sample))
+
+    @staticmethod
+    def next_indexes(query_indexes: list[int], num_points: int) -> list[int]:
+        """
+        Indexes of the next layer: the folded value at i is in the coset leaf
+        i mod num_points of the next commitment, which opens it along the way.
+        """
+        return sorted({i % num_points for i in query_indexes})
+
+    def generate_query(self, alpha) -> list[Query]:
 
         res = []
         N = len(self.curr_codeword.domain)
+        h = len(self.next_codeword.domain)
+        factor = N // h
+        omega = self.curr_codeword.domain.generator ** h
 
         for i in self.query_indexes:
-            a = self.curr_codeword.domain.values[i]  # type: ignore
-            f_a = self.curr_codeword.get_index(i)
-
+            x = self.curr_codeword.domain.values[i]  # type: ignore
+            coset_values = [self.curr_codeword.get_index(i + t * h) for t in range(factor)]
 
-            b = self.curr_codeword.domain.values[N // 2 + i]  # type: ignore
-            f_b = self.curr_codeword.get_index(N // 2 + i)
-
-            c = a * a
+            c = x**factor
             c_f_star = self.next_codeword.get_index(i)
 
             # CHECK COLINEARITY FOR GODS SAKE
-            two_inv = MainFieldElement(2) ** -1
-            a_inv = a**-1
-            c_f_star_expected = two_inv * (
-                (f_a + f_b) + alpha * (f_a - f_b) * (a_inv)
-            )  # type: ignore
+            c_f_star_expected = FoldingEngine.fold_coset(coset_values, x, omega, alpha)
             
             if c_f_star != c_f_star_expected:
                 raise ValueError(
                     f"Colinearity check failed: {c_f_star} != {c_f_star_expected}"
                 )
 
-            proof_a = curr_merkle.get_sibling_path_to_root(i)
-            proof_b = curr_merkle.get_sibling_path_to_root(N // 2 + i)
-            proof_c = next_merkle.get_sibling_path_to_root(i)
-
-            query = Query((a, f_a), (b, f_b), (c, c_f_star), proof_a, proof_b, proof_c)
-            res.append(query)
+            res.append(Query(i, x, coset_values, (c, c_f_star)))
 
         return res
 
 
 class Round:
-    def __init__(self, merkle_root: int, queries: list[Query]):
+    def __init__(self, merkle_root: "list[bytes]"):
+        # Commitment to one layer: the cap of its Merkle tree ([root] without a cap).
         self.merkle_root = merkle_root
+
+
+class Opening:
+    def __init__(self, queries: list[Query], coset_proof: list[bytes]):
+        # The queried coset leaves of one layer, with one multiproof for all
+        # of them. Their folded values are opened by the next layer's cosets.
         self.queries = queries
+        self.coset_proof = coset_proof
 
     @staticmethod
-    def generate_next_round(
+    def generate(
         alpha,
+        query_indexes: list[int],
         curr_codeword: ReedSolomonCode,
         next_codeword: ReedSolomonCode,
-        curr_merkle: MerkleTree[int],
-        next_merkle: MerkleTree[int],
-    ) -> "Round":
-
-        next_merkle_root = next_merkle.get_root().value
-
-        query_generator = QueryGenerator(alpha.value, curr_codeword, next_codeword)
-        queries = query_generator.generate_query(alpha, curr_merkle, next_merkle)
+        curr_merkle: MerkleTree,
+    ) -> "Opening":
 
-        return Round(next_merkle_root, queries)
+        query_generator = QueryGenerator(query_indexes, curr_codeword, next_codeword)
+        queries = query_generator.generate_query(alpha)
+        return Opening(queries, curr_merkle.open_many(query_indexes))
 
 
 class Prover:
     global_params = GlobalParameters
 
-    def __init__(self, state_machine_: StateMachine) -> None:
+    def __init__(self, state_machine_: StateMachine, max_degree: "int | None" = None) -> None:
         self.state_machine = state_machine_
         self.composite_poly = state_machine_.compute_polynomial(
-            self.global_params.group_domain
+            self.global_params.coset_domain
         )  # assume boundary and transition constraints are combined into one polynomial
+        # The public degree bound, the one the verifier is given: the number of
+        # folding rounds is counted from it on both sides, not from the actual degree.
+        self.max_degree = self.composite_poly.deg() if max_degree is None else max_degree
+        if self.composite_poly.deg() > self.max_degree:
+            raise ValueError("Composite polynomial exceeds the degree bound.")
+        # Committed on the coset w * <g> rather than <g>, off the trace domain
         self.start_codeword_val = self.composite_poly.evaluate_domain(
-            self.global_params.group_domain
+            self.global_params.coset_domain
         )  # expand by 4 * colinearity for ZK
-        self.start_codeword = ReedSolomonCode(self.start_codeword_val, self.composite_poly.deg(), self.global_params.group_domain)  # type: ignore
+        self.start_codeword = ReedSolomonCode(self.start_codeword_val, self.max_degree, self.global_params.coset_domain)  # type: ignore
         assert self.start_codeword.check_poly()  
 
     def prove(self, proof_stream_: ProofStream):
+        # Commit phase: one Round per committed layer, each folding challenge
+        # drawn after that layer's commitment, then the final polynomial.
         curr_codeword = self.start_codeword
-        curr_merkle = MerkleTree(
-            curr_codeword.values, self.global_params.combine_hash
-        )  # need to check if this works
-
-        proof_stream_.push(Round(curr_merkle.get_root().value, []))
-        for _ in range(GlobalParameters.num_rounds):
-            alpha = int.from_bytes(
-                proof_stream_.prover_communicating(), "big"
-            )
-            alpha = MainFieldElement(alpha)
-            next_codeword = self.generate_next_codeword(
-                alpha, curr_codeword, curr_codeword.domain
+        factor = self.global_params.folding_factor
+        self.folding = FoldingEngine(curr_codeword.domain, factor)
+        codewords = [curr_codeword]
+        merkles = []
+        alphas = []
+
+        num_rounds = num_folding_rounds(curr_codeword.max_degree)
+        for layer in range(num_rounds):
+            curr_merkle = curr_codeword.commit(factor)
+            merkles.append(curr_merkle)
+            proof_stream_.push(Round(curr_merkle.get_cap()))
+
+            alpha = self.global_params.challenge_field.sample(
+                proof_stream_.prover_communicating()
             )
-            next_merkle = MerkleTree(
-                next_codeword.values, self.global_params.combine_hash
+            alphas.append(alpha)
+            curr_codeword = self.generate_next_codeword(
+                alpha, curr_codeword, layer
             )
-
-            next_round = Round.generate_next_round(
-                alpha,
-                curr_codeword,
-                next_codeword,
-                curr_merkle,
-                next_merkle,
+            codewords.append(curr_codeword)
+
+        # What is left has a small degree bound: send its coefficients. The
+        # last folded codeword is not committed, the verifier checks its
+        # queried values against this polynomial instead.
+        final_poly = Polynomial.interpolate(curr_codeword.domain.values, curr_codeword.values)
+        if final_poly.deg() > curr_codeword.max_degree:
+            raise ValueError("Final codeword does not satisfy the degree bound.")
+        proof_stream_.push(final_poly)
+
+        # Query phase: positions only depend on the transcript once everything is committed
+        seed = proof_stream_.prover_communicating()
+        for layer in range(num_rounds):
+            h = len(codewords[layer + 1])
+            if layer == 0:
+                query_indexes = QueryGenerator.sample_indexes(seed, h)
+            else:
+                query_indexes = QueryGenerator.next_indexes(query_indexes, h)
+
+            proof_stream_.push(
+                Opening.generate(
+                    alphas[layer],
+                    query_indexes,
+                    codewords[layer],
+                    codewords[layer + 1],
+                    merkles[layer],
+                )
             )
 
-            proof_stream_.push(next_round)
-
-            curr_codeword = next_codeword
-            curr_merkle = next_merkle
-
-        proof_stream_.push(curr_codeword.values)
-
     def generate_next_codeword(
-        self, alpha: FieldElement, curr_codeword: ReedSolomonCode, curr_domain: Domain
+        self, alpha: FieldElement, curr_codeword: ReedSolomonCode, layer: int
     ) -> ReedSolomonCode:
-        n = len(curr_codeword)
-        two_inv = MainFieldElement(2) ** -1
-        
-        next_codeword_val = []
-        for i in range(n // 2):
-            x = curr_domain.values[i]
-            assert x == -curr_domain.values[n // 2 + i], "Domain values are not paired correctly." 
-            f_x = curr_codeword[i]
-            f_minus_x = curr_codeword[i + n // 2]
-
-            val = two_inv * ((f_x + f_minus_x) + alpha * (f_x - f_minus_x) * (x ** -1))  # type: ignore
-            next_codeword_val.append(val)
-
-        next_domain = curr_domain.sq_domain()
-        next_max_degree = curr_codeword.max_degree // 2
+        next_codeword_val = self.folding.fold(curr_codeword.values, alpha, layer)
+        next_domain = self.folding.domain(layer + 1)
+        next_max_degree = curr_codeword.max_degree // self.folding.factor
         
         next_codeword = ReedSolomonCode(next_codeword_val, next_max_degree, next_domain)
         
@@ -231,112 +274,196 @@ class Verifier:
         self.max_degree = max_degree
 
     def verify(self, proof_stream: ProofStream) -> bool:
-        rounds: list[Round] = [proof_stream.pull() for _ in range(self.global_params.num_rounds + 1)]  # type: ignore
-        final_codeword_values: list = proof_stream.pull()  # type: ignore
-        if not all(isinstance(r, Round) for r in rounds):
+        num_rounds = num_folding_rounds(self.max_degree)
+        # Replays the transcript: each folding challenge right after its
+        # layer's commitment, the query seed after the final polynomial.
+        rounds: list[Round] = []
+        alphas = []
+        try:
+            for _ in range(num_rounds):
+                rounds.append(proof_stream.pull())  # type: ignore
+                alphas.append(
+                    self.global_params.challenge_field.sample(proof_stream.verifier_communicating())
+                )
+            final_poly: Polynomial = proof_stream.pull()  # type: ignore
+            seed = proof_stream.verifier_communicating()
+            openings: list[Opening] = [proof_stream.pull() for _ in range(num_rounds)]  # type: ignore
+        except IndexError:
+            # Fewer objects than the rounds counted from the degree bound
+            return False
+        if (
+            not all(isinstance(r, Round) for r in rounds)
+            or not isinstance(final_poly, Polynomial)
+            or not all(isinstance(o, Opening) for o in openings)
+        ):
             return False
 
+        factor = self.global_params.folding_factor
+        if final_poly.deg() > self.max_degree // (factor**num_rounds):
+            return False
+
+        # Caps of exactly the configured width: the prover does not get to pick it
+        cap_height = self.global_params.merkle_cap_height
+        size = self.global_params.size_of_group
+        for i, commitment in enumerate(rounds):
+            num_leaves = size // factor ** (i + 1)
+            width = 1 << MerkleTree.clamp_cap_height(num_leaves, cap_height)
+            if not isinstance(commitment.merkle_root, list) or len(commitment.merkle_root) != width:
+                return False
+
+        hash_function = self.global_params.hash_function
+        # omega of order m: the same at every layer
+        omega = self.global_params.g ** (size // factor)
 
-        alphas = []
-        challenge_ps = ProofStream()
-        for i in range(self.global_params.num_rounds):
-            challenge_ps.push(rounds[i])
-            alpha_bytes = challenge_ps.prover_communicating()
-            alpha: MainFieldElement = MainFieldElement(int.from_bytes(alpha_bytes))
-            alphas.append(alpha)
-            _ = challenge_ps.prover_communicating()
-        
         # Reconstruct domain and verify queries
-        for i in range(self.global_params.num_rounds - 1):
-            prev_round = rounds[i]
-            curr_round = rounds[i + 1]
+        folded = {}  # index -> c_f_star of the previous round, opened by this one
+        for i in range(num_rounds):
+            commitment = rounds[i]
+            opening = openings[i]
             alpha = alphas[i]
-            
-            if not curr_round.queries:
+            last = i == num_rounds - 1
+            # Layer i: N points offset^(m^i) * (g^(m^i))^j, folded onto h = N / m
+            N = size // factor**i
+            h = N // factor
+            g_i = self.global_params.g ** (factor**i)
+            offset_i = self.global_params.w ** (factor**i)
+
+            if i == 0:
+                indexes = QueryGenerator.sample_indexes(seed, h)
+            else:
+                indexes = QueryGenerator.next_indexes(indexes, h)
+            if [query.index for query in opening.queries] != indexes:
                 return False
-            
-            x_values = []
-            y_values = []
-
-            
-            for query in curr_round.queries:
-                
-                
-                x_values.append(query.a)
-                x_values.append(query.b) # this is b if I'm not mistaken. Technically we can choose not to send these values at all, and then just reconstruct them, from the original domain.
-                y_values.append(query.f_a)
-                y_values.append(query.f_b)
-                                
-                proof_a_valid = MerkleTree.verify_path(
-                    query.f_a.value,
-                    query.proof_a,
-                    prev_round.merkle_root,
-                    self.global_params.combine_hash,
-                )
-                proof_b_valid = MerkleTree.verify_path(
-                    query.f_b.value,
-                    query.proof_b,
-                    prev_round.merkle_root,
-                    self.global_params.combine_hash,
-                )
-                proof_c_valid = MerkleTree.verify_path(
-                    query.c_f_star.value,
-                    query.proof_c,
-                    curr_round.merkle_root,
-                    self.global_params.combine_hash,
-                )
 
-                if not (proof_a_valid and proof_b_valid and proof_c_valid):
+            leaves = {}
+            for query in opening.queries:
+                if len(query.coset_values) != factor or query.x != offset_i * g_i**query.index:
                     return False
+                leaves[query.index] = b"".join(bytes(value) for value in query.coset_values)
+                # The values folded last round are in this round's cosets
+                for t, value in enumerate(query.coset_values):
+                    if folded.pop(query.index + t * h, value) != value:
+                        return False
 
-                two_inv = MainFieldElement(2) ** -1
-                f_a, f_b, a = query.f_a, query.f_b, query.a
-                expected_c_f_star = two_inv * (
-                    (f_a + f_b) + alpha * (f_a - f_b) * (a ** -1)
-                )
+                expected_c_f_star = FoldingEngine.fold_coset(query.coset_values, query.x, omega, alpha)
                 if expected_c_f_star != query.c_f_star:
                     return False
-            
-            # Reconstruct the polynomial from the queries and check that the degree is less than max degree, thus it must be the correct codeword.
-            poly = Polynomial.interpolate(x_values, y_values)
-            print(f"Polynomial degree: {poly.deg()}, expected max degree: {self.max_degree // (2**i)}")
-            
-
-            
-
-        final_domain_size = len(final_codeword_values)
-        if final_domain_size == 0:
-            return False
-
-        final_g = self.global_params.g ** (2**self.global_params.num_rounds)
-        final_domain = Domain.generate_domain(final_g, final_domain_size)
-
-        final_poly = Polynomial.interpolate(final_domain.values, final_codeword_values)
-
-        expected_degree = self.max_degree // (2**self.global_params.num_rounds)
+                if last and final_poly(query.x**factor) != query.c_f_star:
+                    # The last folded codeword is the final polynomial, checked at the queried points only
+                    return False
+            if folded:
+                return False
+            folded = {query.index: query.c_f_star for query in opening.queries}
 
-        if final_poly.deg() > expected_degree:
-            return False
+            if not MerkleTree.verify_many(
+                leaves, opening.coset_proof, commitment.merkle_root, hash_function, h, cap_height
+            ):
+                return False
 
         return True
 
 
 if __name__ == "__main__":
-    state_machine = StateMachine(None, None, 10, 1)  # type: ignore
-    # this proves to verifier that that the polynomial is X ** 2 + 1
-    max_degree = state_machine.compute_polynomial(None).deg()  # type: ignore
-
-    prover = Prover(state_machine)
-
-    proof_stream = ProofStream()
-
-    prover.prove(proof_stream)
 
-    proof_bytes = proof_stream.serialization()
-    print("Num bytes in proof stream:", len(proof_bytes))
-
-    verifier = Verifier(max_degree)
-
-    is_valid = verifier.verify(proof_stream)
-
-    assert is_valid, "The FRI proof did not pass verification."
+    class RandomPolynomialSource:
+        """Stands in for a StateMachine: a random polynomial of the given degree."""
+
+        def __init__(self, degree: int, seed: int = 0):
+            rng = random.Random(seed)
+            field = GlobalParameters.field
+            self.polynomial = Polynomial([field.element(rng.randrange(field.p)) for _ in range(degree + 1)])
+
+        def compute_polynomial(self, domain):
+            return self.polynomial
+
+    def test_fri():
+        max_degree = 127
+        proof_stream = ProofStream()
+        Prover(RandomPolynomialSource(max_degree), max_degree).prove(proof_stream)  # type: ignore
+        print("Num bytes in proof stream:", len(proof_stream.serialization()))
+        assert Verifier(max_degree).verify(proof_stream), "The FRI proof did not pass verification."
+
+    def test_degree_below_bound():
+        # Degree 5 under a public bound of 10: both sides fold the same number of rounds
+        proof_stream = ProofStream()
+        Prover(RandomPolynomialSource(5), 10).prove(proof_stream)  # type: ignore
+        assert Verifier(10).verify(proof_stream)
+        # A truncated transcript is rejected, not an IndexError
+        proof_stream.objects.pop()
+        proof_stream.read_index = 0
+        assert not Verifier(10).verify(proof_stream)
+
+    def build_proof(degree: int, claimed_degree: int, cheat: bool) -> ProofStream:
+        # Runs the prover's steps by hand on a degree `degree` codeword claimed
+        # to have degree `claimed_degree`. With `cheat`, layer 1 is replaced by
+        # the low-degree interpolant of the honest fold at the positions the
+        # queries were once drawn from (int(alpha) of the first round), which
+        # passes if the prover can predict the queries.
+        params = GlobalParameters
+        factor = params.folding_factor
+        codeword = ReedSolomonCode(
+            RandomPolynomialSource(degree, 1).polynomial.evaluate_domain(params.coset_domain),
+            claimed_degree,
+            params.coset_domain,
+        )
+        folding = FoldingEngine(codeword.domain, factor)
+        proof_stream = ProofStream()
+        codewords, merkles, alphas = [codeword], [], []
+        num_rounds = num_folding_rounds(claimed_degree)
+        for layer in range(num_rounds):
+            merkles.append(codeword.commit(factor))
+            proof_stream.push(Round(merkles[-1].get_cap()))
+            alpha = params.challenge_field.sample(proof_stream.prover_communicating())
+            alphas.append(alpha)
+            folded = folding.fold(codeword.values, alpha, layer)
+            domain = folding.domain(layer + 1)
+            if cheat and layer == 0:
+                predicted = QueryGenerator.sample_indexes(int(alpha), len(domain))  # type: ignore
+                forged = Polynomial.interpolate(
+                    [domain.values[i] for i in predicted], [folded[i] for i in predicted]
+                )
+                folded = forged.evaluate_domain(domain)
+            codeword = ReedSolomonCode(folded, codeword.max_degree // factor, domain)
+            codewords.append(codeword)
+        proof_stream.push(Polynomial.interpolate(codeword.domain.values, codeword.values))
+
+        seed = proof_stream.prover_communicating()
+        for layer in range(num_rounds):
+            curr, next_ = codewords[layer], codewords[layer + 1]
+            h = len(next_)
+            indexes = (
+                QueryGenerator.sample_indexes(seed, h)
+                if layer == 0
+                else QueryGenerator.next_indexes(indexes, h)
+            )
+            queries = [
+                Query(
+                    i,
+                    curr.domain.values[i],
+                    [curr.get_index(i + t * h) for t in range(factor)],
+                    (curr.domain.values[i] ** factor, next_.get_index(i)),
+                )
+                for i in indexes
+            ]
+            proof_stream.push(Opening(queries, merkles[layer].open_many(indexes)))
+        return proof_stream
+
+    def test_low_degree_forgery():
+        assert Verifier(127).verify(build_proof(127, 127, cheat=False))
+        # Degree 1023 claimed as 127, layer 1 forged as a degree 19 polynomial
+        assert not Verifier(127).verify(build_proof(1023, 127, cheat=True))
+
+    def test_cap_width():
+        # A prover committing every leaf digest as the "cap", opened with empty multiproofs
+        GlobalParameters.merkle_cap_height = 64
+        proof_stream = ProofStream()
+        Prover(RandomPolynomialSource(127), 127).prove(proof_stream)  # type: ignore
+        assert Verifier(127).verify(proof_stream)
+        GlobalParameters.merkle_cap_height = 0
+        proof_stream.read_index = 0
+        assert not Verifier(127).verify(proof_stream)
+
+    test_fri()
+    test_degree_below_bound()
+    test_low_degree_forgery()
+    test_cap_width()
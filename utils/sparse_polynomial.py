@@ -0,0 +1,247 @@
+from utils.field import FieldElement, Field, FieldVector
+from utils.polynomial import Polynomial, PolynomialException
+
+
+def sparse_multiply_raw(f: "list[int]", terms: "list[tuple[int, int]]", p: "int") -> "list[int]":
+    """Product of the dense f and sum(a * X^e) in O(len(f) * len(terms))."""
+    res = [0] * (len(f) + terms[-1][0])
+    for e, a in terms:
+        for i, c in enumerate(f):
+            res[i + e] += c * a
+    return [c % p for c in res]
+
+
+def sparse_divmod_raw(
+    f: "list[int]", terms: "list[tuple[int, int]]", p: "int"
+) -> "tuple[list[int], list[int]]":
+    """
+    Quotient and remainder of the dense f by sum(a * X^e), by long division:
+    each quotient coefficient only touches len(terms) remainder coefficients,
+    so the whole division is O(len(f) * len(terms)).
+    """
+    m, lead = terms[-1]
+    n = len(f) - 1
+    if n < m:
+        return [0], f[: max(n + 1, 1)]
+    lead_inv = pow(lead, p - 2, p)
+    lower = terms[:-1]
+    rem = list(f)
+    q = [0] * (n - m + 1)
+    for i in range(n, m - 1, -1):
+        c = rem[i] * lead_inv % p
+        if c == 0:
+            continue
+        q[i - m] = c
+        shift = i - m
+        for e, a in lower:
+            rem[shift + e] = (rem[shift + e] - c * a) % p
+    return q, rem[: max(m, 1)]
+
+
+class SparsePolynomial:
+    """
+    Polynomial stored as its non-zero (exponent, coefficient) terms, sorted by
+    exponent. Meant for vanishing polynomials such as X^T - 1 or X - g^t, which
+    stay a handful of terms however long the trace is: products and quotients
+    with a dense Polynomial cost O(n * terms) and evaluation O(terms * log deg).
+    """
+
+    def __init__(
+        self, field: "Field", terms: "dict[int, FieldElement] | list[tuple[int, FieldElement]]"
+    ):
+        if isinstance(terms, dict):
+            terms = list(terms.items())
+        collected: "dict[int, FieldElement]" = {}
+        for exp, coef in terms:
+            if not isinstance(exp, int) or exp < 0:
+                raise PolynomialException("Exponents must be non-negative integers.")
+            if coef.field is not field:
+                raise PolynomialException(
+                    "Coefficients of the polynomial must belong to the same field."
+                )
+            collected[exp] = collected[exp] + coef if exp in collected else coef
+        self.field = field
+        self.terms = sorted(
+            (exp, coef) for exp, coef in collected.items() if not coef.is_zero()
+        )
+
+    @classmethod
+    def binomial(cls, field: "Field", exp: "int", constant: "FieldElement") -> "SparsePolynomial":
+        """X^exp - constant."""
+        return cls(field, [(exp, field.one), (0, -constant)])
+
+    @classmethod
+    def from_dense(cls, poly: "Polynomial") -> "SparsePolynomial":
+        element = poly.field.element
+        return cls(poly.field, [(exp, element(c)) for exp, c in enumerate(poly.residues)])
+
+    def to_dense(self) -> "Polynomial":
+        if self.is_zero():
+            return Polynomial.zero(self.field)
+        residues = [self.field.zero.value] * (self.deg() + 1)
+        for exp, c in self.terms:
+            residues[exp] = c.value
+        return Polynomial.from_residues(self.field, residues)
+
+    def deg(self) -> "int":
+        return self.terms[-1][0] if self.terms else -1
+
+    def is_zero(self) -> "bool":
+        return not self.terms
+
+    def __repr__(self) -> "str":
+        return f"SparsePolynomial(terms = {self.terms}, field = {self.field})"
+
+    def __str__(self) -> "str":
+        if self.is_zero():
+            return "0"
+        return " + ".join(
+            f"{coef}" if exp == 0 else f"X^{exp}" if coef == self.field.one else f"{coef}*X^{exp}"
+            for exp, coef in self.terms
+        )
+
+    def __eq__(self, b: object) -> "bool":
+        if isinstance(b, Polynomial):
+            return self.to_dense() == b
+        if not isinstance(b, SparsePolynomial):
+            return False
+        return self.field is b.field and self.terms == b.terms
+
+    def __neg__(self) -> "SparsePolynomial":
+        return SparsePolynomial(self.field, [(exp, -coef) for exp, coef in self.terms])
+
+    def __add__(self, b: "SparsePolynomial | Polynomial | FieldElement"):
+        if isinstance(b, FieldElement):
+            return SparsePolynomial(self.field, self.terms + [(0, b)])
+        if isinstance(b, SparsePolynomial):
+            if b.field is not self.field:
+                raise PolynomialException("Cannot add polynomials over different fields.")
+            return SparsePolynomial(self.field, self.terms + b.terms)
+        if isinstance(b, Polynomial):
+            return self.to_dense() + b
+        return NotImplemented
+
+    def __radd__(self, b: "Polynomial | FieldElement"):
+        return self.__add__(b)
+
+    def __sub__(self, b: "SparsePolynomial | Polynomial | FieldElement"):
+        return self.__add__(-b)
+
+    def __rsub__(self, b: "Polynomial | FieldElement"):
+        return (-self).__add__(b)
+
+    def __mul__(self, b: "SparsePolynomial | Polynomial | FieldElement"):
+        if isinstance(b, FieldElement):
+            return SparsePolynomial(self.field, [(exp, coef * b) for exp, coef in self.terms])
+        if isinstance(b, SparsePolynomial):
+            if b.field is not self.field:
+                raise PolynomialException("Cannot multiply polynomials over different fields.")
+            return SparsePolynomial(
+                self.field,
+                [(e1 + e2, c1 * c2) for e1, c1 in self.terms for e2, c2 in b.terms],
+            )
+        if isinstance(b, Polynomial):
+            if b.field is not self.field or not isinstance(self.field, Field):
+                return self.to_dense() * b
+            if self.is_zero() or b.is_zero():
+                return Polynomial.zero(self.field)
+            terms = [(exp, coef.value) for exp, coef in self.terms]
+            return Polynomial.from_residues(
+                self.field, sparse_multiply_raw(b.residues, terms, self.field.p)
+            )
+        return NotImplemented
+
+    def __rmul__(self, b: "Polynomial | FieldElement"):
+        return self.__mul__(b)
+
+    def __pow__(self, exp: "int") -> "SparsePolynomial":
+        res = SparsePolynomial(self.field, [(0, self.field.one)])
+        base = self
+        while exp > 0:
+            if exp & 1:
+                res = res * base
+            exp >>= 1
+            if exp > 0:
+                base = base * base
+        return res
+
+    @staticmethod
+    def divide(
+        numerator: "Polynomial | SparsePolynomial", denominator: "SparsePolynomial"
+    ) -> "tuple[Polynomial, Polynomial]":
+        """Dense quotient and remainder of `numerator` by the sparse `denominator`."""
+        if isinstance(numerator, SparsePolynomial):
+            numerator = numerator.to_dense()
+        if denominator.is_zero():
+            raise PolynomialException("Cannot divide by zero polynomial")
+        field = denominator.field
+        if numerator.field is not field or not isinstance(field, Field):
+            return Polynomial.divide(numerator, denominator.to_dense())
+        q, r = sparse_divmod_raw(
+            numerator.residues,
+            [(exp, coef.value) for exp, coef in denominator.terms],
+            field.p,
+        )
+        return Polynomial.from_residues(field, q), Polynomial.from_residues(field, r)
+
+    def __rfloordiv__(self, numerator: "Polynomial") -> "Polynomial":
+        quotient, _ = SparsePolynomial.divide(numerator, self)
+        return quotient
+
+    def __rmod__(self, numerator: "Polynomial") -> "Polynomial":
+        _, rem = SparsePolynomial.divide(numerator, self)
+        return rem
+
+    def __call__(self, arg: "Polynomial | FieldElement"):
+        if isinstance(arg, Polynomial):
+            return self.to_dense()(arg)
+        if not isinstance(arg, FieldElement):
+            raise PolynomialException("Polynomials can only be evaluated at field elements.")
+        if isinstance(self.field, Field) and arg.field is self.field:
+            p = self.field.p
+            x = arg.value
+            return self.field.element(sum(c.value * pow(x, exp, p) for exp, c in self.terms) % p)
+        value = (arg.field if getattr(arg.field, "base", None) is self.field else self.field).zero
+        for exp, c in self.terms:
+            value = value + c * arg**exp
+        return value
+
+    def evaluate_many(self, points: "list[FieldElement] | FieldVector") -> "FieldVector":
+        """Evaluations at every point, one vectorised power per term."""
+        if not isinstance(points, FieldVector):
+            points = FieldVector.from_elements(points[0].field, points)
+        res = FieldVector(points.field, [points.field.zero.value] * len(points))
+        for exp, c in self.terms:
+            res = res + (points**exp) * c
+        return res
+
+
+if __name__ == "__main__":
+    import random
+
+    def test_sparse():
+        field = Field.main()
+        rng = random.Random(0)
+
+        def rand():
+            return field.element(rng.randrange(field.p))
+
+        T = 64
+        g = field.primitive_nth_root(T)
+        vanishing = SparsePolynomial.binomial(field, T, field.one)
+        assert all(vanishing(g**i).is_zero() for i in range(T))
+        assert vanishing.to_dense() == Polynomial.zerofier([g**i for i in range(T)])
+        assert vanishing.evaluate_many([g**i for i in range(T)]) == FieldVector(field, [0] * T)
+
+        dense = Polynomial([rand() for _ in range(200)])
+        sparse = SparsePolynomial(field, [(0, rand()), (5, rand()), (64, rand())])
+        assert sparse * dense == sparse.to_dense() * dense == dense * sparse
+        q, r = SparsePolynomial.divide(dense, sparse)
+        assert (q, r) == Polynomial.divide(dense, sparse.to_dense())
+        assert dense // sparse == q and dense % sparse == r
+
+        x = rand()
+        assert sparse(x) == sparse.to_dense()(x)
+        assert (sparse * sparse)(x) == sparse(x) ** 2 and (sparse - sparse).is_zero()
+
+    test_sparse()
@@ -2,106 +2,34 @@ from utils.transition import TransitionConstraint
 from utils.boundary import BoundaryConstraint
 from utils.matrix import Matrix, Vector
 from utils.domain import Domain
-from utils.polynomial import Polynomial
-from utils.field import Field, MainFieldElement, FieldElement
+from utils.polynomial import Polynomial, SubproductTree
+from utils.sparse_polynomial import SparsePolynomial
+from utils.field import Field, MainFieldElement, FieldElement, FieldVector
+from utils.ntt import ntt, intt, coset_lde
 
 
 from utils.params import GlobalParameters
 
 
-def ntt(coeffs: list[FieldElement], generator: FieldElement) -> list[FieldElement]:
-    n = len(coeffs)
-
-    # n must be a power of two.
-    if n > 0 and (n & (n - 1)) != 0:
-        raise ValueError("Length of coefficients list must be a power of two.")
-
-    if n <= 1:
-        return coeffs
-
-    even_coeffs = coeffs[0::2]
-    odd_coeffs = coeffs[1::2]
-
-    generator_sq = generator**2
-
-    ntt_even = ntt(even_coeffs, generator_sq)
-    ntt_odd = ntt(odd_coeffs, generator_sq)
-
-    return [
-        ntt_even[i % (n // 2)] + (generator**i) * ntt_odd[i % (n // 2)]
-        for i in range(n)
-    ]
-
-
-def intt(evals: list[FieldElement], generator: FieldElement) -> list[FieldElement]:
-
-    n = len(evals)
-
-    generator_inv = generator**-1
-
-    coeffs_unscaled = ntt(evals, generator_inv)
-
-    n_inv = MainFieldElement(n) ** -1
-
-    coeffs = [(c * n_inv) for c in coeffs_unscaled]
-
-    return coeffs
-
 def primitive_root_check(primitive_root, root_order):
-    return (primitive_root ** root_order == MainFieldElement(1)) and (primitive_root ** (root_order//2) != MainFieldElement(1))
+    one = primitive_root.field.one
+    return (primitive_root ** root_order == one) and (primitive_root ** (root_order//2) != one)
 
 
 def fast_multiply(lhs_poly: Polynomial, rhs_poly: Polynomial, primitive_root: FieldElement, root_order: int) -> Polynomial:
     assert primitive_root_check(primitive_root, root_order), "Issues with primitive root given for fast_multiply"
 
-    if lhs_poly.is_zero() or lhs_poly.is_zero():
-        return Polynomial([])
-
-    max_degree = lhs_poly.deg() + rhs_poly.deg()
-
-    if max_degree < 8:
-        return lhs_poly * rhs_poly
-
-    
-    generator = primitive_root
-    while max_degree < root_order // 2:
-        generator = generator ** 2
-        root_order = root_order // 2
-
-    lhs_coefficients = lhs_poly.coef[:(lhs_poly.deg()+1)] #TODO: Should rectify with Synchro
-    while len(lhs_coefficients) < root_order:
-        lhs_coefficients += [MainFieldElement(0)]
-    rhs_coefficients = rhs_poly.coef[:(rhs_poly.deg()+1)]  #TODO: Should rectify with Synchro
-    while len(rhs_coefficients) < root_order:
-        rhs_coefficients += [MainFieldElement(0)]
-
-    lhs_codeword = ntt(lhs_coefficients, generator)
-    rhs_codeword = ntt(rhs_coefficients, generator)
-
-    product_in_eval_space = [l * r for (l, r) in zip(lhs_codeword, rhs_codeword)]
-
-    product_poly_coefficients = intt(product_in_eval_space, generator)
-    return Polynomial(product_poly_coefficients[0:(max_degree+1)]) # TODO: Should fix this with synchro
-
-
-# TODO: Implement modulo division for polynomials 
-
+    # Polynomial.__mul__ already switches to an NTT for large operands.
+    return lhs_poly * rhs_poly
 
 
 def fast_zerofier(domain, primitive_root, root_order):
     assert primitive_root_check(primitive_root, root_order), "Issues with primitive root given for fast_zerofier"
 
     if len(domain) == 0:
-        return Polynomial([])
+        return Polynomial.one(primitive_root.field)
 
-    if len(domain) == 1:
-        return Polynomial([-domain[0], MainFieldElement(1)])
-
-    half = len(domain) // 2
-
-    left = fast_zerofier(domain[:half], primitive_root, root_order)
-    right = fast_zerofier(domain[half:], primitive_root, root_order)
-    return fast_multiply(left, right, primitive_root, root_order)
+    return SubproductTree.for_points(domain).zerofier()
 
 def fast_evaluate(polynomial: Polynomial, domain: list[FieldElement], primitive_root, root_order ):
     assert primitive_root_check(primitive_root, root_order), "Issues with primitive root given for fast_evaluate"
@@ -109,23 +37,13 @@ def fast_evaluate(polynomial: Polynomial, domain: list[FieldElement], primitive_
     if len(domain) == 0:
         return []
 
-    if len(domain) == 1:
-        return [polynomial(domain[0])]
-
-    half = len(domain) // 2
-
-    left_zerofier = fast_zerofier(domain[:half], primitive_root, root_order)
-    right_zerofier = fast_zerofier(domain[half:], primitive_root, root_order)
-
-    left = fast_evaluate(polynomial % left_zerofier, domain[:half], primitive_root, root_order)
-    right = fast_evaluate(polynomial % right_zerofier, domain[half:], primitive_root, root_order)
-
-    return left + right
+    # One tree per point set, shared by every polynomial evaluated on it
+    return list(SubproductTree.for_points(domain).evaluate(polynomial))
 
 
 class StateMachine:
     def __init__(
-        self, transition_matrix: "Matrix", init_vector: "Vector", T: int, domain: Domain
+        self, transition_matrix: "Matrix", init_vector: "Vector", T: int, domain: Domain, blowup: "int | None" = None
     ):
         self.transition_matrix = transition_matrix
         self.init_vector = init_vector
@@ -133,11 +51,20 @@ class StateMachine:
         self.w = len(self.init_vector.values)
         self.domain = domain
         self.small_domain = domain
-        while self.T < len(self.small_domain) // 2:
-            print("SQ DOMAIN")
-            self.small_domain = self.small_domain.sq_domain()  # Blowup factor of 4
-
-        assert T < len(self.small_domain)
+        # Smallest subgroup holding the trace: exactly T points when T is a power
+        # of 2, so that the trace domain vanishes on the sparse X^T - 1.
+        while self.T <= len(self.small_domain) // 2:
+            self.small_domain = self.small_domain.sq_domain()
+
+        assert T <= len(self.small_domain)
+        # The trace is extended to a coset of a subgroup blowup times larger, by
+        # default the size of `domain`. The offset keeps it off the trace domain.
+        self.blowup = blowup if blowup is not None else len(self.domain) // len(self.small_domain)
+        lde_size = self.blowup * len(self.small_domain)
+        field = self.small_domain.generator.field
+        self.lde_domain = Domain.generate_domain(field.primitive_nth_root(lde_size), lde_size).offset_domain(
+            GlobalParameters.w if GlobalParameters.field is field else field.generator()
+        )
         assert self.transition_matrix.is_square()
         assert (
             self.transition_matrix.columns == self.init_vector.rows
@@ -165,12 +92,21 @@ class StateMachine:
             for i in range(self.w)
         ]
 
-    def trace_poly_lde(self, trace_polynomials: list[Polynomial]):
-        result = []
-        for trace_poly in trace_polynomials:
-            trace_poly_lde = fast_evaluate(trace_poly, self.domain.values, self.domain.generator, len(self.domain))
-            result.append(trace_poly_lde)
-        return result
+    def trace_lde(self, computation_trace: list[list[FieldElement]]) -> list[FieldVector]:
+        # Every register extended to lde_domain at once, straight from the trace
+        assert len(self.small_domain) == self.T, "The coset LDE needs a power-of-two trace length."
+        registers = [
+            [computation_trace[i][j] for i in range(self.T)] for j in range(self.w)
+        ]
+        return coset_lde(registers, self.lde_domain.offset, self.blowup)
+
+    def trace_poly_lde(self, trace_polynomials: list[Polynomial]) -> list[FieldVector]:
+        return [trace_poly.evaluate_domain(self.lde_domain) for trace_poly in trace_polynomials]
+
+    def divide_on_lde(self, values: FieldVector, zerofier: SparsePolynomial) -> FieldVector:
+        # Pointwise quotient on lde_domain; the zerofiers of the trace domain
+        # have no root on the coset, so no evaluation is a division by zero.
+        return values * zerofier.evaluate_many(self.lde_domain.values).inverse()
         
     def transition_poly(self, trace_polynomials: list[Polynomial]):
         # For each w_i = (TRACE[i][0], TRACE[i][1], ... TRACE[i][|w|-1]) where |w| is num registers
@@ -179,9 +115,9 @@ class StateMachine:
         transition_polynomials = []
         generator_small_domain = self.small_domain.generator
         for j, row in enumerate(self.transition_matrix.matrix):
-            dot_pdt = sum([trace_poly * scalar for scalar, trace_poly in zip(row, trace_polynomials)], Polynomial([MainFieldElement(0)]))
-            print(type(generator_small_domain), type(Polynomial.X(Field.main())))
-            t_j_o_times_x = trace_polynomials[j](Polynomial.X(Field.main()) * generator_small_domain)
+            dot_pdt = sum([trace_poly * scalar for scalar, trace_poly in zip(row, trace_polynomials)], Polynomial.zero(generator_small_domain.field))
+            # t_j(g * X), the register one row later
+            t_j_o_times_x = trace_polynomials[j].scale(generator_small_domain)
             transition_polynomials.append(dot_pdt - t_j_o_times_x)
         return transition_polynomials
             
@@ -193,9 +129,33 @@ class StateMachine:
         return boundary_polynomials
     
     
-    def boundary_zerofier(self, boundary_registers_times, trace_polynomials: list[Polynomial], computation_trace: list[list[FieldElement]]):
-        pass
-    
+    def boundary_zerofier(self, boundary_registers_times) -> list[SparsePolynomial]:
+        # X - g^time for each boundary constraint, in the order of boundary_poly
+        field = self.small_domain.generator.field
+        return [
+            SparsePolynomial.binomial(field, 1, self.small_domain.values[time])
+            for _, time in boundary_registers_times
+        ]
+
+    def transition_zerofier(self) -> SparsePolynomial:
+        # The transition constraints hold on every row but the last one. When the
+        # trace fills its subgroup, their zerofier is (X^T - 1) / (X - g^(T-1)):
+        # only X^T - 1 is kept here, and transition_quotients multiplies the
+        # numerators by X - g^(T-1) instead of dividing by it.
+        field = self.small_domain.generator.field
+        if len(self.small_domain) == self.T:
+            return SparsePolynomial.binomial(field, self.T, field.one)
+        return SparsePolynomial.from_dense(Polynomial.zerofier(self.small_domain.values[: self.T]))
+
+    def transition_quotients(self, transition_polynomials: list[Polynomial]) -> list[Polynomial]:
+        zerofier = self.transition_zerofier()
+        last_row = Polynomial.X(zerofier.field) - self.small_domain.values[self.T - 1]
+        return [(poly * last_row) // zerofier for poly in transition_polynomials]
+
+    def boundary_quotients(self, boundary_registers_times, boundary_polynomials: list[Polynomial]) -> list[Polynomial]:
+        zerofiers = self.boundary_zerofier(boundary_registers_times)
+        return [poly // zerofier for poly, zerofier in zip(boundary_polynomials, zerofiers)]
+
     def generate_AIR_polynomials(self, boundary_registers_times):
         computation_trace = self.compute_trace()
         trace_polynomials = self.compute_trace_polynomials(computation_trace)
@@ -203,7 +163,9 @@ class StateMachine:
         transition_polynomials = self.transition_poly(trace_polynomials)
         boundary_polynomials = self.boundary_poly(boundary_registers_times, trace_polynomials, computation_trace)
         
-        boundary_zerofier = None
+        transition_quotients = self.transition_quotients(transition_polynomials)
+        boundary_quotients = self.boundary_quotients(boundary_registers_times, boundary_polynomials)
+        return transition_quotients, boundary_quotients
 
 
 if __name__ == "__main__":
@@ -246,6 +208,10 @@ if __name__ == "__main__":
     trace_ldes = sm.trace_poly_lde(trace_polys)
     print(f"  - Generated {len(trace_ldes)} LDEs, each of size {len(trace_ldes[0])}.")
 
+    trace_columns = sm.trace_lde(trace)
+    assert trace_columns == trace_ldes
+    print(f"  - Coset LDE of the trace: {len(trace_columns)} columns of size {len(trace_columns[0])}, blowup {sm.blowup}.")
+
     # 4. Get the transition constraint polynomials
     transition_polys = sm.transition_poly(trace_polys)
     print(f"  - Generated {len(transition_polys)} transition constraint polynomials.")
@@ -262,4 +228,20 @@ if __name__ == "__main__":
     print(f"    Boundary 0: {boundary_polys[0]}")
     print(f"    Boundary 1: {boundary_polys[1]}")
 
+    # 6. Divide by the sparse zerofiers: the constraints must vanish where they apply
+    transition_quotients = sm.transition_quotients(transition_polys)
+    zerofier = sm.transition_zerofier()
+    last_row = Polynomial.X(zerofier.field) - sm.small_domain.values[TRACE_LENGTH - 1]
+    for poly, quotient in zip(transition_polys, transition_quotients):
+        assert quotient * zerofier == poly * last_row
+    for poly, quotient, boundary_zerofier in zip(
+        boundary_polys,
+        sm.boundary_quotients(boundary_definitions, boundary_polys),
+        sm.boundary_zerofier(boundary_definitions),
+    ):
+        assert quotient * boundary_zerofier == poly
+    boundary_quotient_lde = sm.divide_on_lde(sm.trace_poly_lde(boundary_polys)[0], sm.boundary_zerofier(boundary_definitions)[0])
+    assert boundary_quotient_lde == sm.trace_poly_lde(sm.boundary_quotients(boundary_definitions, boundary_polys))[0]
+    print(f"  - Zerofiers: transition {zerofier}, boundary {sm.boundary_zerofier(boundary_definitions)[0]}")
+
     print("\nWorkflow demonstration complete.")
\ No newline at end of file